@@ -0,0 +1,279 @@
+""" Benchmarks for the hot paths of validit.
+
+Each benchmark validates synthetic data that is generated from its template
+with a fixed seed, so the results of different runs (and of different versions
+of validit) are comparable.
+
+Usage:
+
+    python benchmarks/run.py                    # run all of the benchmarks
+    python benchmarks/run.py options list       # only benchmarks whose name
+                                                # contains 'options' or 'list'
+    python benchmarks/run.py --save before.json
+    python benchmarks/run.py --compare before.json --threshold 0.1
+
+When comparing, the script exits with a non-zero exit code if one of the
+benchmarks became slower than the baseline by more than the threshold.
+"""
+
+import io
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+import statistics
+
+# Benchmark the version of validit in this repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validit import (  # noqa: E402
+    Template,
+    TemplateAny,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    Options,
+    Validate,
+    ValidateFromJSON,
+    ValidateFromYAML,
+    ValidateFromTOML,
+    is_valid,
+    __version__,
+)
+from validit.generate import generate, generate_many  # noqa: E402
+
+SEED = 2021
+BENCHMARKS = dict()
+
+
+def benchmark(name):
+    """ Registers a benchmark. The decorated function recives the scale of the
+    benchmark, prepares the data and returns the function that is timed. """
+
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def scaled(count, scale):
+    return max(1, int(count * scale))
+
+
+record = TemplateDict(
+    id=Template(int),
+    name=Template(str),
+    score=Template(int, float),
+    active=Template(bool),
+    tags=TemplateList(Template(str), valid_lengths=range(6)),
+    nickname=Optional(Template(str)),
+    kind=Options('user', 'admin', 'bot'),
+)
+
+
+@benchmark('validate-wide-dict')
+def wide_dict(scale):
+    template = TemplateDict(**{
+        f'field{index}': Template((int, str, float, bool)[index % 4])
+        for index in range(300)
+    })
+    documents = list(generate_many(template, scaled(50, scale), SEED))
+    return lambda: [Validate(template, data) for data in documents]
+
+
+@benchmark('validate-deep-nesting')
+def deep_nesting(scale):
+    template = Template(int)
+    for depth in range(15):
+        template = TemplateDict(value=Template(int), child=template)
+    template = TemplateList(template, valid_lengths=[scaled(200, scale)])
+    data = generate(template, SEED)
+    return lambda: Validate(template, data)
+
+
+@benchmark('validate-long-list')
+def long_list(scale):
+    template = TemplateList(Template(int, float),
+                            valid_lengths=[scaled(200_000, scale)])
+    data = generate(template, SEED)
+    return lambda: Validate(template, data)
+
+
+@benchmark('validate-records')
+def records(scale):
+    template = TemplateList(record, valid_lengths=[scaled(20_000, scale)])
+    data = generate(template, SEED)
+    return lambda: Validate(template, data)
+
+
+@benchmark('validate-records-lazy')
+def records_lazy(scale):
+    template = TemplateList(record, valid_lengths=[scaled(20_000, scale)])
+    data = generate(template, SEED)
+    return lambda: Validate(template, data, lazy=True).errors
+
+
+@benchmark('is-valid-records')
+def records_is_valid(scale):
+    template = TemplateList(record, valid_lengths=[scaled(20_000, scale)])
+    data = generate(template, SEED)
+    return lambda: is_valid(template, data)
+
+
+@benchmark('validate-large-options')
+def large_options(scale):
+    codes = Options(*(f'SKU-{index:05}' for index in range(5000)))
+    template = TemplateList(TemplateDict(sku=codes),
+                            valid_lengths=[scaled(50_000, scale)])
+    data = generate(template, SEED)
+    return lambda: Validate(template, data)
+
+
+@benchmark('validate-any-blobs')
+def any_blobs(scale):
+    template = TemplateList(
+        TemplateDict(id=Template(int), metadata=TemplateAny()),
+        valid_lengths=[scaled(2000, scale)],
+    )
+    data = generate(template, SEED)
+    return lambda: Validate(template, data)
+
+
+@benchmark('validate-error-heavy')
+def error_heavy(scale):
+    template = TemplateList(record)
+    data = list(generate_many(
+        record, scaled(10_000, scale), SEED, error_rate=0.5))
+    return lambda: str(Validate(template, data).errors)
+
+
+@benchmark('generate-records')
+def generate_records(scale):
+    count = scaled(20_000, scale)
+    return lambda: sum(1 for _ in generate_many(
+        record, count, SEED, error_rate=0.1))
+
+
+def file_benchmark(validator, dumps, scale):
+    template = TemplateDict(
+        records=TemplateList(
+            TemplateDict(
+                id=Template(int),
+                name=Template(str),
+                score=Template(float),
+                tags=TemplateList(Template(str), valid_lengths=range(6)),
+            ),
+            valid_lengths=[scaled(5000, scale)],
+        ),
+    )
+
+    text = dumps(generate(template, SEED))
+    return lambda: validator(template, io.StringIO(text))
+
+
+@benchmark('file-json')
+def file_json(scale):
+    return file_benchmark(ValidateFromJSON, json.dumps, scale)
+
+
+@benchmark('file-yaml')
+def file_yaml(scale):
+    import yaml
+    return file_benchmark(ValidateFromYAML, yaml.safe_dump, scale)
+
+
+@benchmark('file-toml')
+def file_toml(scale):
+    import toml
+    return file_benchmark(ValidateFromTOML, toml.dumps, scale)
+
+
+def measure(func, repeat):
+    """ Returns the best and the median time of a single call, in seconds. """
+
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [total / number for total in timer.repeat(repeat, number)]
+    return min(times), statistics.median(times)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        description='Run the validit benchmarks.')
+    parser.add_argument(
+        'names', nargs='*',
+        help='run only benchmarks whose name contains one of these strings')
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='number of times each benchmark is measured (default: 5)')
+    parser.add_argument(
+        '--scale', type=float, default=1.0,
+        help='multiplies the size of the benchmark data (default: 1.0)')
+    parser.add_argument(
+        '--save', metavar='PATH',
+        help='save the results into a JSON file')
+    parser.add_argument(
+        '--compare', metavar='PATH',
+        help='compare the results with results saved using --save')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='slowdown that is reported as a regression (default: 0.1)')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+
+    baseline = dict()
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)['results']
+
+    results = dict()
+    regressions = list()
+
+    for name, setup in BENCHMARKS.items():
+        if args.names and not any(part in name for part in args.names):
+            continue
+
+        try:
+            func = setup(args.scale)
+        except ImportError as error:
+            print(f'{name:<28} skipped ({error})')
+            continue
+
+        best, median = measure(func, args.repeat)
+        results[name] = {'best': best, 'median': median}
+        line = f'{name:<28} {best * 1000:10.3f} ms {median * 1000:10.3f} ms'
+
+        if name in baseline:
+            change = best / baseline[name]['best'] - 1
+            line += f' {change:+8.1%}'
+            if change > args.threshold:
+                regressions.append(name)
+                line += '  REGRESSION'
+
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({
+                'validit': __version__,
+                'python': platform.python_version(),
+                'scale': args.scale,
+                'results': results,
+            }, file, indent=2)
+
+    if regressions:
+        print(f'\n{len(regressions)} benchmark(s) regressed by more than '
+              f'{args.threshold:.0%}: {", ".join(regressions)}')
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import pytest
+
+
+def summarize(result):
+    """ Returns the errors (their types, paths and messages) and the data of
+    a validation result, so results of different validators can be
+    compared. """
+    return [(type(e), e.path, e.msg) for e in result.errors], result.data
+
+
+@pytest.fixture
+def summary():
+    """ The function that summarizes validation results (see `summarize`). """
+    return summarize
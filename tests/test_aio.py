@@ -0,0 +1,174 @@
+import asyncio
+import json
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from validit import (
+    Template,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    Validate,
+    avalidate,
+    AsyncValidateFromJSON,
+)
+
+from validit.errors.parsing import JsonParsingError
+from validit.parsers import get_parser
+
+template = TemplateDict(
+    name=Template(str),
+    records=TemplateList(
+        TemplateDict(
+            id=Template(int),
+            tags=TemplateList(Template(str), valid_lengths=range(3)),
+            note=Optional(Template(str)),
+        ),
+        valid_lengths=range(1, 100),
+    ),
+)
+
+documents = [
+    {'name': 'valid', 'records': [{'id': 1, 'tags': ['a']}]},
+    {'name': 'empty', 'records': []},
+    {'name': 123, 'records': 'none'},
+    'not a dict',
+    {'records': [
+        {'id': index, 'tags': ['a'] * (index % 4), 'note': index % 3 or None}
+        for index in range(250)
+    ]},
+]
+
+
+def run(coroutine):
+    # `asyncio.run` is not available in Python 3.6
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+@pytest.mark.parametrize('fail_fast', [False, True])
+@pytest.mark.parametrize('data', documents)
+def test_avalidate_matches_validate(data, fail_fast, summary):
+    expected = Validate(template, data, fail_fast=fail_fast)
+    got = run(avalidate(template, data, fail_fast=fail_fast, chunk_size=7))
+    assert summary(got) == summary(expected)
+
+
+def test_avalidate_yields_to_event_loop():
+    data = {'name': 'many', 'records': [{'id': 1, 'tags': []}] * 5000}
+    ticks = 0
+
+    async def count_ticks():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        counter = asyncio.ensure_future(count_ticks())
+        result = await avalidate(template, data, chunk_size=100)
+        counter.cancel()
+        return result
+
+    result = run(main())
+    assert len(result.errors) == 1
+    assert ticks >= 5000 // 100 - 1
+
+
+def test_avalidate_executor(summary):
+    data = documents[-1]
+    expected = Validate(template, data)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        got = run(avalidate(template, data, executor=executor, threshold=1))
+
+    assert summary(got) == summary(expected)
+
+
+@pytest.mark.parametrize('data', documents)
+def test_async_validate_from_json(data, summary):
+    async def main():
+        stream = asyncio.StreamReader()
+        stream.feed_data(json.dumps(data).encode())
+        stream.feed_eof()
+        return await AsyncValidateFromJSON(template, stream, title='body')
+
+    got = run(main())
+    expected = Validate(template, data)
+    assert summary(got) == summary(expected)
+    assert str(got).startswith('\x1b[36mbody') or not got.errors
+
+
+def test_async_validate_from_json_parsing_error():
+    async def main():
+        stream = asyncio.StreamReader()
+        stream.feed_data(b'{"name": ')
+        stream.feed_eof()
+        return await AsyncValidateFromJSON(template, stream)
+
+    error, = run(main()).errors
+    assert isinstance(error, JsonParsingError)
+
+
+@pytest.mark.parametrize('nested', [
+    TemplateList(TemplateDict(items=TemplateList(Template(int)))),
+    TemplateList(TemplateList(Template(int))),
+])
+def test_avalidate_yields_in_nested_lists(nested, summary):
+    if isinstance(nested.template, TemplateDict):
+        data = [{'items': [1] * 5000}, {'items': [2] * 4999 + ['x']}]
+    else:
+        data = [[1] * 5000, [2] * 4999 + ['x']]
+    ticks = 0
+
+    async def count_ticks():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        counter = asyncio.ensure_future(count_ticks())
+        result = await avalidate(nested, data, chunk_size=100)
+        counter.cancel()
+        return result
+
+    result = run(main())
+    assert summary(result) == summary(Validate(nested, data))
+    assert ticks >= 10000 // 100 - 1
+
+
+def test_async_validate_from_json_parses_in_executor(summary):
+    threads = set()
+
+    class RecordingBackend(type(get_parser('json'))):
+        def loads_buffer(self, buffer):
+            threads.add(threading.current_thread())
+            return super().loads_buffer(buffer)
+
+    async def main(threshold):
+        stream = asyncio.StreamReader()
+        stream.feed_data(json.dumps(documents[-1]).encode())
+        stream.feed_eof()
+        return await AsyncValidateFromJSON(
+            template, stream, parser=RecordingBackend(),
+            executor=executor, threshold=threshold)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        got = run(main(threshold=1))
+        assert threads and threading.main_thread() not in threads
+
+        threads.clear()
+        run(main(threshold=10 ** 9))
+        assert threads == {threading.main_thread()}
+
+    assert summary(got) == summary(Validate(template, documents[-1]))
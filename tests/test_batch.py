@@ -0,0 +1,75 @@
+import pytest
+
+from validit import (
+    Template,
+    TemplateDict,
+    TemplateList,
+    Validate,
+    validate_many,
+)
+from validit.errors import (
+    TemplateCheckInvalidDataError as WrongTypeError,
+    TemplateCheckMissingDataError as MissingDataError,
+)
+
+template = TemplateDict(
+    username=Template(str),
+    codes=TemplateList(Template(int)),
+)
+
+documents = [
+    {'username': 'RealA10N', 'codes': [1, 2, 3]},
+    {'username': 123, 'codes': [1, 'two']},
+    {'username': 'elonmusk', 'codes': []},
+    {'codes': [1]},
+]
+
+
+def test_validity():
+    results = validate_many(template, documents)
+
+    assert len(results) == 4
+    assert list(results) == [True, False, True, False]
+    assert results[0] and not results[1]
+
+
+def test_errors_only_for_invalid():
+    results = validate_many(template, iter(documents))
+
+    assert set(results.errors) == {1, 3}
+    assert [(type(e), e.path) for e in results.errors[1]] == [
+        (WrongTypeError, ('username',)),
+        (WrongTypeError, ('codes', 1)),
+    ]
+    assert [type(e) for e in results.errors[3]] == [MissingDataError]
+
+
+def test_fail_fast():
+    results = validate_many(template, documents, fail_fast=True)
+    assert [len(errors) for errors in results.errors.values()] == [1, 1]
+
+
+@pytest.mark.parametrize('fail_fast', [False, True])
+def test_errors_match_validate(fail_fast):
+    results = validate_many(template, documents, fail_fast=fail_fast)
+
+    for index, errors in results.errors.items():
+        expected = Validate(template, documents[index], fail_fast=fail_fast)
+        assert [(type(e), e.path, e.msg) for e in errors] == \
+            [(type(e), e.path, e.msg) for e in expected.errors]
+
+
+@pytest.mark.parametrize('documents', ([], [{'username': 'A', 'codes': []}]))
+def test_no_errors(documents):
+    results = validate_many(template, documents)
+    assert not results.errors and str(results) == ''
+
+
+def test_parallel():
+    many = documents * 50
+    serial = validate_many(template, many)
+    parallel = validate_many(template, many, workers=2, chunk_size=7)
+
+    assert list(parallel) == list(serial)
+    assert set(parallel.errors) == set(serial.errors)
+    assert str(parallel) == str(serial)
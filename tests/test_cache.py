@@ -0,0 +1,120 @@
+import pickle
+
+import pytest
+import yaml
+
+from validit import (
+    Template,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    Cached,
+    Validate,
+    is_valid,
+    intern_template,
+)
+
+from validit.cache import ValidationCache
+from validit.exceptions import InvalidTemplateConfiguration
+
+record = TemplateDict(
+    name=Template(str),
+    defaults=TemplateDict(
+        retries=Template(int),
+        tags=TemplateList(Template(str)),
+    ),
+    note=Optional(Template(str)),
+)
+
+document = yaml.safe_load('''
+base: &base
+  retries: 3
+  tags: [a, b]
+broken: &broken
+  retries: three
+  tags: [a, 2]
+records:
+  - {name: first, defaults: *base}
+  - {name: second, defaults: *base, note: hi}
+  - {name: third, defaults: *broken}
+  - {name: 4, defaults: *broken}
+  - {name: fifth, defaults: *base}
+''')
+
+
+def test_cached_matches_validate(summary):
+    template = TemplateDict(records=TemplateList(record))
+    cached = Cached(template)
+
+    assert summary(Validate(cached, document)) == \
+        summary(Validate(template, document))
+
+    # The shared valid block is validated only once, and the invalid block
+    # is validated (and reported) each time it appears.
+    assert cached.cache.hits == 2
+    assert summary(Validate(cached, document)) == \
+        summary(Validate(template, document))
+    assert not is_valid(cached, document)
+
+
+def test_cached_reuses_valid_objects():
+    cached = Cached(TemplateList(record))
+    records = document['records']
+
+    first = Validate(cached, [records[0]])
+    second = Validate(cached, [records[0], records[1]])
+
+    assert not first.errors and not second.errors
+    assert second.data[0] is first.data[0]
+
+
+def test_cache_eviction():
+    cache = ValidationCache(maxsize=2)
+    dump = cache.wrap(
+        TemplateList(Template(int)),
+        lambda data, link, errors: list(data),
+    )
+
+    lists = [[1], [2], [3]]
+    for data in lists:
+        dump(data, None, None)
+
+    assert len(cache) == 2 and cache.misses == 3
+
+    dump(lists[2], None, None)
+    dump(lists[0], None, None)
+    assert cache.hits == 1 and cache.misses == 4
+
+
+def test_cached_pickle(summary):
+    cached = Cached(TemplateList(record), maxsize=10)
+    Validate(cached, document['records'])
+    assert len(cached.cache)
+
+    loaded = pickle.loads(pickle.dumps(cached))
+    assert len(loaded.cache) == 0 and loaded.cache.maxsize == 10
+    assert summary(Validate(loaded, document['records'])) == \
+        summary(Validate(cached, document['records']))
+
+
+def test_cached_wrappers_keep_their_caches():
+    first = Cached(TemplateList(record), maxsize=1)
+    second = Cached(TemplateList(record), maxsize=2)
+
+    # Wrappers of the same template are different, since their results are
+    # stored in different caches
+    assert first != second and len({first, second}) == 2
+    assert first.fingerprint == second.fingerprint
+
+    records = document['records'][:2]
+    Validate(TemplateDict(first=first, second=second),
+             {'first': records, 'second': records})
+    assert len(first.cache) == 1 and len(second.cache) == 2
+
+    assert intern_template(second) is not intern_template(first)
+    assert intern_template(second).cache is second.cache
+
+
+def test_cached_invalid_template():
+    with pytest.raises(InvalidTemplateConfiguration):
+        Cached(int)
@@ -2,6 +2,9 @@ import pytest
 
 from validit.utils import DefaultValue
 from validit.containers import HeadContainer
+from validit.compiler import CompiledTemplate
+from validit.exceptions import InvalidTemplateConfiguration
+from validit.errors.managers import TemplateCheckErrorCollection
 
 from validit import (
     Template,
@@ -121,6 +124,25 @@ cases = [
                 'out': ['hello', {}]},
         )
     },
+    {
+        'name': 'nested-missing',
+        'template': TemplateDict(
+            info=TemplateDict(user=Template(str)),
+            codes=TemplateList(Template(int)),
+            extra=Optional(TemplateDict(user=Template(str))),
+        ),
+        'cases': (
+            {'in': {}, 'out': {}},
+            {'in': {'info': 5}, 'out': {'info': 5}},
+            {'in': {'info': {}}, 'out': {'info': {}}},
+            {'in': {'codes': 'NotAList', 'other': []},
+                'out': {'codes': 'NotAList'}},
+            {'in': {'info': {'code': 1}, 'codes': [1, 'two']},
+                'out': {'info': {}, 'codes': [1, 'two']}},
+            {'in': None, 'out': None},
+            {'in': DefaultValue, 'out': DefaultValue},
+        ),
+    },
 ]
 
 
@@ -154,3 +176,42 @@ def test_dumps(template, iin, out):
             f"expected: '{out}'\n"
             f"got: '{container.data}'\n"
         )
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+@pytest.mark.parametrize('template, iin, out', generate_params())
+def test_compiled_dumps(template, iin, out, backend):
+
+    errors = TemplateCheckErrorCollection()
+    data = CompiledTemplate(template, backend).dump(iin, errors)
+
+    if data != out:
+        pytest.fail(
+            'Compiled dump result unexpected\n'
+            f"expected: '{out}'\n"
+            f"got: '{data}'\n"
+        )
+
+
+@pytest.mark.parametrize('backend', [None, *CompiledTemplate.BACKENDS])
+@pytest.mark.parametrize('policy', TemplateAny.COPY_POLICIES)
+def test_any_copy_policy(policy, backend):
+    data = {'metadata': [{'key': 'value'}]}
+    template = TemplateAny(copy=policy)
+
+    if backend is None:
+        container = HeadContainer()
+        template.container_dump(container, data)
+        dumped = container.data
+    else:
+        errors = TemplateCheckErrorCollection()
+        dumped = CompiledTemplate(template, backend).dump(data, errors)
+
+    assert dumped == data
+    assert (dumped is data) is (policy == 'share')
+    assert (dumped['metadata'] is data['metadata']) is (policy != 'deep')
+
+
+def test_any_invalid_copy_policy():
+    with pytest.raises(InvalidTemplateConfiguration):
+        TemplateAny(copy='sometimes')
@@ -0,0 +1,91 @@
+""" Test the containers that the templates use to access the data. """
+
+import pytest
+
+from validit.utils import DefaultValue
+from validit.containers import HeadContainer, PathContainer
+
+
+def nested(depth, leaf):
+    """ Returns data that is nested `depth` levels deep, and the path to the
+    leaf. Dictionaries and lists are nested alternately. """
+
+    data, path = leaf, ()
+    for level in range(depth):
+        if level % 2:
+            data, path = [data], (0,) + path
+        else:
+            data, path = {f'key{level}': data}, (f'key{level}',) + path
+    return data, path
+
+
+def descend(container, path):
+    for index in path:
+        container = container[index]
+    return container
+
+
+@pytest.mark.parametrize('head', [HeadContainer, PathContainer])
+def test_deep_path_and_data(head):
+    data, path = nested(12, 'leaf')
+    container = descend(head(data), path)
+
+    assert container.path == path
+    assert container.data == 'leaf'
+
+    # Reading the data again returns the same data
+    assert container.data == 'leaf' and container.path == path
+
+
+def test_missing_data():
+    head = HeadContainer({'user': {}})
+    assert head['user']['name'].data is DefaultValue
+    assert head['code'].data is DefaultValue
+    assert head['user']['name'].path == ('user', 'name')
+
+
+def test_write_through_children():
+    head = HeadContainer({'user': {'codes': [1, 2]}})
+    codes = head['user']['codes']
+
+    codes[1].data = 3
+    head['user']['name'].data = 'Alon'
+    assert head.data == {'user': {'codes': [1, 3], 'name': 'Alon'}}
+
+
+def test_write_after_head_is_replaced():
+    head = HeadContainer({'user': {'name': 'old'}})
+    name = head['user']['name']
+    assert name.data == 'old'
+
+    old = head.data
+    head.data = {'user': {'name': 'new'}}
+    assert name.data == 'new'
+
+    name.data = 'newer'
+    assert head.data == {'user': {'name': 'newer'}}
+    assert old == {'user': {'name': 'old'}}
+
+
+def test_write_after_parent_is_replaced():
+    head = HeadContainer({'user': {'name': 'old'}})
+    user = head['user']
+    name = user['name']
+    assert name.data == 'old'
+
+    user.data = {'name': 'new'}
+    assert name.data == 'new'
+
+    name.data = 'newer'
+    assert head.data == {'user': {'name': 'newer'}}
+
+
+def test_children_created_before_the_data():
+    head = HeadContainer()
+    name = head['user']['name']
+
+    head.data = dict()
+    head['user'].data = dict()
+    name.data = 'Alon'
+    assert head.data == {'user': {'name': 'Alon'}}
+    assert name.data == 'Alon'
@@ -1,7 +1,14 @@
 """ Test the creation of a template structure. """
 
 import pytest
-from validit import Template, TemplateDict, TemplateList, Optional, Options
+from validit import (
+    Template,
+    TemplateAny,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    Options,
+)
 from validit.exceptions import InvalidTemplateConfiguration, InvalidDefaultValue
 
 
@@ -166,3 +173,76 @@ class TestOptions:
     ))
     def test_creation(self, instances):
         Options(*instances)
+
+
+def make_templates():
+    """ Returns a list of different templates. Each call creates new
+    instances of the same templates. """
+
+    return [
+        Template(str),
+        Template(int, str),
+        Template(str, int),
+        TemplateAny(),
+        TemplateAny(copy='deep'),
+        TemplateList(Template(str)),
+        TemplateList(Template(str), valid_lengths=range(3)),
+        TemplateDict(user=Template(str)),
+        TemplateDict(user=Template(str), code=Template(int)),
+        TemplateDict(code=Template(int), user=Template(str)),
+        Optional(Template(str)),
+        Optional(Template(str), default='guest'),
+        Options('yes', 'no'),
+        Options('yes', ['no']),
+        Options(1),
+        Options(True),
+    ]
+
+
+class TestTemplateEquality:
+
+    @pytest.mark.parametrize('index', range(len(make_templates())))
+    def test_equal(self, index):
+        template, same = make_templates()[index], make_templates()[index]
+
+        assert template == same and not template != same
+        assert hash(template) == hash(same)
+        assert template.fingerprint == same.fingerprint
+
+    def test_not_equal(self):
+        templates = make_templates()
+        assert len(set(templates)) == len(templates)
+        assert len({t.fingerprint for t in templates}) == len(templates)
+
+    def test_dict_keys(self):
+        routes = {template: index
+                  for index, template in enumerate(make_templates())}
+
+        for index, template in enumerate(make_templates()):
+            assert routes[template] == index
+
+    def test_not_equal_to_other_objects(self):
+        assert Template(str) != str
+        assert Options('yes') != 'yes'
+
+    def test_subclass_arguments(self):
+
+        class Exact(Template):
+            def __init__(self, value):
+                super().__init__(int)
+                self.value = value
+
+        assert Exact(1) == Exact(1)
+        assert Exact(1) != Exact(2)
+        assert len({Exact(1), Exact(2), Exact(1)}) == 2
+
+    def test_objects_are_compared_by_identity(self):
+        example = ExampleObj()
+        assert Options(example) == Options(example)
+
+        # Different objects with the same `repr` are not confused
+        ExampleObj.__repr__ = lambda self: 'ExampleObj()'
+        try:
+            assert Options(ExampleObj()) != Options(ExampleObj())
+        finally:
+            del ExampleObj.__repr__
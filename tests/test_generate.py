@@ -0,0 +1,127 @@
+import pytest
+
+from validit import (
+    Template,
+    TemplateAny,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    Options,
+    Cached,
+    Validate,
+)
+
+from validit.exceptions import ValidItError
+from validit.generate import DataGenerator, generate, generate_many
+from validit.utils import DefaultValue
+
+
+TEMPLATES = {
+    'scalars': TemplateList(Template(int, float, str, bool, type(None))),
+    'any': TemplateAny(),
+    'options': TemplateList(TemplateDict(value=Options(1, 'a', [1, 2]))),
+    'lengths': TemplateDict(
+        exact=TemplateList(Template(int), valid_lengths=[3]),
+        ranged=TemplateList(Template(str), valid_lengths=range(2, 5)),
+    ),
+    'nested': TemplateDict(
+        name=Template(str),
+        tags=TemplateList(Template(str, bytes)),
+        extra=Optional(TemplateDict(value=Template(object))),
+        mapping=Template(dict, tuple),
+        cached=Cached(TemplateList(TemplateDict(id=Template(int)))),
+    ),
+}
+
+
+@pytest.mark.parametrize('name', TEMPLATES)
+@pytest.mark.parametrize('seed', range(10))
+def test_generated_data_is_valid(name, seed):
+    template = TEMPLATES[name]
+    assert not Validate(template, generate(template, seed)).errors
+
+
+@pytest.mark.parametrize('name', [name for name in TEMPLATES if name != 'any'])
+@pytest.mark.parametrize('seed', range(10))
+def test_generated_invalid_data(name, seed):
+    template = TEMPLATES[name]
+    generator = DataGenerator(seed)
+    for _ in range(10):
+        # Each invalid document contains a single mismatch
+        data = generator.invalid(template)
+        assert len(Validate(template, data).errors) == 1
+
+
+def test_generate_invalid_any():
+    generator = DataGenerator(0)
+    assert generator.invalid(TemplateAny()) is DefaultValue
+
+    # The value can only be invalid if it is missing
+    template = TemplateDict(value=TemplateAny())
+    for _ in range(10):
+        assert Validate(template, generator.invalid(template)).errors
+
+    with pytest.raises(ValidItError):
+        DataGenerator(error_rate=1).document(TemplateAny())
+
+    with pytest.raises(ValidItError):
+        generator.invalid(Optional(TemplateAny()))
+
+
+@pytest.mark.parametrize('error_rate', [0, 0.25, 1])
+def test_generate_many(error_rate):
+    template = TEMPLATES['nested']
+    documents = list(generate_many(
+        template, 2000, seed=1, error_rate=error_rate))
+
+    assert len(documents) == 2000
+    invalid = sum(bool(Validate(template, data).errors) for data in documents)
+    assert invalid == pytest.approx(2000 * error_rate, abs=100)
+
+
+def test_generate_many_is_lazy():
+    documents = generate_many(Template(int), seed=0)
+    assert all(isinstance(next(documents), int) for _ in range(100))
+
+
+def test_generate_is_reproducible():
+    template = TEMPLATES['nested']
+    assert generate(template, 'seed') == generate(template, 'seed')
+    assert any(generate(template, 'seed') != generate(template, seed)
+               for seed in range(10))
+
+
+def test_generate_optional_rate():
+    template = TemplateDict(value=Optional(Template(int)))
+
+    generator = DataGenerator(seed=0, optional_rate=0)
+    assert all('value' in generator.generate(template) for _ in range(20))
+
+    generator = DataGenerator(seed=0, optional_rate=1)
+    assert all(generator.generate(template) == {} for _ in range(20))
+
+
+def test_generate_unsupported_template():
+
+    class Even(Template):
+        def validate(self, data, path, errors):
+            super().validate(data, path, errors)
+            if data % 2:
+                errors.register_error(ValidItError('odd'))
+
+    # The generator can't know which data the custom validation accepts
+    with pytest.raises(ValidItError):
+        generate(Even(int))
+
+
+def test_generate_unsupported_type():
+
+    class Point:
+        def __init__(self, x, y):
+            pass
+
+    with pytest.raises(ValidItError):
+        generate(Template(Point))
+
+    with pytest.raises(ValidItError):
+        generate(TemplateList(Template(int), valid_lengths=[-1]))
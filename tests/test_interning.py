@@ -0,0 +1,121 @@
+import gc
+
+from validit import (
+    Template,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    Cached,
+    Validate,
+    intern_template,
+)
+
+from validit.errors import TemplateCheckError
+from validit.interning import TemplateInterner
+
+
+def address():
+    return TemplateDict(
+        street=Template(str),
+        city=Template(str),
+        zip=Optional(Template(str, int)),
+    )
+
+
+def schema(mirror=None):
+    if mirror is None:
+        mirror = Cached(TemplateDict(main=address()))
+
+    return TemplateDict(
+        home=address(),
+        work=Optional(address()),
+        previous=TemplateList(address()),
+        mirror=mirror,
+    )
+
+
+def test_intern_shares_sub_templates():
+    interner = TemplateInterner()
+    mirror = Cached(TemplateDict(main=address()))
+    first = interner.intern(schema(mirror))
+    second = interner.intern(schema(mirror))
+
+    assert first is second
+    home = first.template['home']
+    assert first.template['previous'].template is home
+    assert first.template['mirror'].template.template['main'] is home
+
+    # Cached templates with different caches are not shared
+    other = interner.intern(schema())
+    assert other is not first
+    assert other.template['home'] is home
+    assert other.template['mirror'] is not first.template['mirror']
+
+
+def test_intern_keeps_results():
+    data = {
+        'home': {'street': 'Main', 'city': 'TLV'},
+        'work': {'street': 1},
+        'previous': [{'street': 'Old', 'city': 'NYC', 'zip': None}],
+        'mirror': {'main': {}},
+    }
+
+    expected = Validate(schema(), data)
+    got = Validate(intern_template(schema()), data)
+
+    assert [(e.path, e.msg) for e in got.errors] == \
+        [(e.path, e.msg) for e in expected.errors]
+    assert got.data == expected.data
+
+
+class Range(Template):
+
+    def __init__(self, lo, hi):
+        super().__init__(int)
+        self.lo, self.hi = lo, hi
+
+    def validate(self, container, errors):
+        super().validate(container, errors)
+        if isinstance(container.data, int) and \
+                not self.lo <= container.data <= self.hi:
+            errors.register_error(TemplateCheckError(container, 'Out of range'))
+
+
+def test_intern_doesnt_change_templates():
+    template = schema()
+    work = template.template['work']
+    previous = template.template['previous'].template
+
+    interned = intern_template(template)
+    assert interned == template and interned is not template
+
+    # The sub-templates of the given template are not replaced
+    assert template.template['work'] is work
+    assert template.template['previous'].template is previous
+    assert interned.template['previous'].template is \
+        interned.template['home']
+
+
+def test_intern_keeps_different_arguments():
+    template = TemplateDict(percent=Range(0, 100), port=Range(1, 65535))
+    data = {'percent': 50, 'port': 8080}
+    assert Validate(template, data).errors.count == 0
+
+    interned = intern_template(template)
+    assert interned.template['percent'] is not interned.template['port']
+    assert Validate(template, data).errors.count == 0
+    assert Validate(interned, data).errors.count == 0
+
+
+def test_interner_holds_weak_references():
+    interner = TemplateInterner()
+    template = interner.intern(schema())
+
+    # The schema, its four fields (one of them is the address), the
+    # dictionary inside the cached template, and the three distinct
+    # templates inside the address
+    assert len(interner) == 9
+
+    del template
+    gc.collect()
+    assert len(interner) == 0
@@ -0,0 +1,222 @@
+import io
+import os
+import pickle
+
+import pytest
+
+from validit import (
+    Template,
+    TemplateDict,
+    ValidateFromJSON,
+    ValidateFromYAML,
+    ValidateFromTOML,
+    ValidateFromBuffer,
+    ValidateFromPath,
+)
+
+from validit.exceptions import MissingExtras, ValidItError
+from validit.errors.parsing import (
+    JsonParsingError,
+    YamlParsingError,
+    TomlParsingError,
+)
+from validit.parsers import (
+    PARSERS,
+    JsonBackend,
+    ParserBackend,
+    get_parser,
+    register_parser,
+)
+
+HERE = os.path.dirname(__file__)
+EXAMPLE = os.path.join(HERE, os.pardir, 'examples', 'example1', 'example1')
+
+VALIDATORS = {
+    'json': (ValidateFromJSON, JsonParsingError),
+    'yaml': (ValidateFromYAML, YamlParsingError),
+    'toml': (ValidateFromTOML, TomlParsingError),
+}
+
+INVALID = {
+    'json': '{\n  "name": "Alon",\n  "age" 17\n}',
+    'yaml': 'name: Alon\nage: [17\n',
+    'toml': 'name = "Alon"\nage = \n',
+}
+
+template = TemplateDict(title=Template(str))
+
+backends = [
+    pytest.param(filetype, backend.name, id=backend.name)
+    for filetype, registered in PARSERS.items()
+    for backend in registered
+]
+
+
+def skip_unavailable(filetype, name):
+    if not get_parser(filetype, PARSERS[filetype][0].name).available() or \
+            not next(b for b in PARSERS[filetype] if b.name == name).available():
+        pytest.skip(f'{name} is not installed')
+
+
+@pytest.mark.parametrize('filetype, name', backends)
+def test_backends_load_the_same_data(filetype, name):
+    skip_unavailable(filetype, name)
+    validator, _ = VALIDATORS[filetype]
+
+    with open(f'{EXAMPLE}.{filetype}', 'r') as file:
+        expected = validator(template, file).data
+
+    with open(f'{EXAMPLE}.{filetype}', 'r') as file:
+        result = validator(template, file, parser=name)
+
+    assert not result.errors
+    assert result.data == expected
+
+
+@pytest.mark.parametrize('filetype, name', backends)
+def test_backends_parsing_errors(filetype, name):
+    skip_unavailable(filetype, name)
+    validator, error_type = VALIDATORS[filetype]
+
+    result = validator(template, io.StringIO(INVALID[filetype]), parser=name)
+    error, = result.errors
+
+    assert isinstance(error, error_type)
+    assert error.msg.startswith(f'Failed to parse {filetype.upper()} file')
+
+
+@pytest.mark.parametrize('filetype, name', [
+    ('json', 'json'), ('yaml', 'pyyaml'), ('toml', 'toml'),
+])
+def test_default_parsers(filetype, name):
+    skip_unavailable(filetype, name)
+    assert get_parser(filetype).name == name
+
+
+def test_default_json_parser_semantics():
+    text = '{"big": 123456789012345678901234567890, "nan": NaN, "inf": Infinity}'
+    result = ValidateFromJSON(
+        TemplateDict(big=Template(int), nan=Template(float),
+                     inf=Template(float)),
+        io.StringIO(text),
+    )
+
+    assert not result.errors
+    assert result.data['big'] == 123456789012345678901234567890
+
+
+def test_unknown_parser():
+    with pytest.raises(ValidItError):
+        ValidateFromJSON(template, io.StringIO('{}'), parser='unknown')
+
+
+def test_register_parser():
+
+    class UpperJsonBackend(JsonBackend):
+        name = 'upper'
+
+        def load(self, fp):
+            return super().loads(fp.read().upper())
+
+    backend = UpperJsonBackend()
+    register_parser(backend, preferred=False)
+
+    try:
+        assert get_parser('json') is not backend
+        result = ValidateFromJSON(
+            template, io.StringIO('{"title": "a"}'), parser='upper')
+        assert result.data == {}
+        assert len(result.errors) == 1
+
+    finally:
+        PARSERS['json'].remove(backend)
+
+
+@pytest.mark.parametrize('filetype, name', backends)
+@pytest.mark.parametrize('wrap', [bytes, bytearray, memoryview])
+def test_validate_from_buffer(filetype, name, wrap):
+    skip_unavailable(filetype, name)
+    validator, _ = VALIDATORS[filetype]
+
+    with open(f'{EXAMPLE}.{filetype}', 'r') as file:
+        expected = validator(template, file).data
+
+    with open(f'{EXAMPLE}.{filetype}', 'rb') as file:
+        buffer = wrap(file.read())
+
+    result = ValidateFromBuffer(template, buffer, filetype, parser=name)
+    assert not result.errors
+    assert result.data == expected
+
+
+@pytest.mark.parametrize('filetype, name', backends)
+def test_validate_from_path(filetype, name):
+    skip_unavailable(filetype, name)
+    validator, _ = VALIDATORS[filetype]
+
+    with open(f'{EXAMPLE}.{filetype}', 'r') as file:
+        expected = validator(template, file).data
+
+    result = ValidateFromPath(template, f'{EXAMPLE}.{filetype}', parser=name)
+    assert not result.errors
+    assert result.data == expected
+
+
+def test_validate_from_path_errors(tmp_path):
+    empty = tmp_path / 'empty.json'
+    empty.write_bytes(b'')
+
+    error, = ValidateFromPath(template, empty).errors
+    assert isinstance(error, JsonParsingError)
+
+    invalid = tmp_path / 'invalid.yml'
+    invalid.write_text(INVALID['yaml'])
+
+    error, = ValidateFromPath(template, invalid).errors
+    assert isinstance(error, YamlParsingError)
+
+    with pytest.raises(ValidItError):
+        ValidateFromPath(template, tmp_path / 'data.txt')
+
+
+@pytest.mark.parametrize('filetype, name', backends)
+def test_invalid_encoding(filetype, name, tmp_path):
+    skip_unavailable(filetype, name)
+    _, error_type = VALIDATORS[filetype]
+    content = {
+        'json': b'{"title": "\xff\xfe"}',
+        'yaml': b'title: \xff\xfe\n',
+        'toml': b'title = "\xff\xfe"\n',
+    }[filetype]
+
+    error, = ValidateFromBuffer(
+        template, content, filetype, parser=name).errors
+    assert isinstance(error, error_type)
+
+    path = tmp_path / f'invalid.{filetype}'
+    path.write_bytes(content)
+    error, = ValidateFromPath(template, path, parser=name).errors
+    assert isinstance(error, error_type)
+
+
+def test_pickle_backend():
+    backend = get_parser('json')
+    backend.require()
+
+    loaded = pickle.loads(pickle.dumps(backend))
+    assert loaded.name == backend.name
+    assert loaded.loads('{"title": "a"}') == {'title': 'a'}
+
+
+def test_missing_backend_modules():
+    with pytest.raises(TypeError):
+        ParserBackend()
+
+    class MissingBackend(JsonBackend):
+        name = 'missing'
+        module_names = ('validit_missing_module',)
+
+    with pytest.raises(MissingExtras) as info:
+        MissingBackend().require()
+    assert str(info.value).endswith(
+        "Use 'pip install validit_missing_module'")
@@ -0,0 +1,127 @@
+import io
+import json
+
+import pytest
+
+from validit import (
+    Template,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    Validate,
+    ValidateFromJSON,
+    ValidateFromJSONLines,
+    ValidateFromBuffer,
+    ValidationStats,
+)
+
+from validit.compiler import CompiledTemplate
+from validit.containers import path_pattern
+from validit.exceptions import InvalidTemplateConfiguration
+
+
+template = TemplateDict(
+    spec=TemplateDict(
+        containers=TemplateList(TemplateDict(
+            name=Template(str),
+            image=Optional(Template(str), 'latest'),
+            ports=TemplateList(Template(int)),
+        )),
+    ),
+)
+
+data = {
+    'spec': {
+        'containers': [
+            {'name': 'web', 'ports': [80, 443]},
+            {'name': 'db', 'image': 'postgres', 'ports': ['5432']},
+        ],
+    },
+}
+
+
+def test_path_pattern():
+    assert path_pattern(()) == ''
+    assert path_pattern(('spec', 'containers', 3)) == '[spec][containers][*]'
+
+
+def test_stats_nodes():
+    stats = ValidationStats()
+    valid = Validate(template, data, stats=stats)
+
+    # The results are the same as without profiling
+    plain = Validate(template, data)
+    assert valid.data == plain.data
+    assert str(valid.errors) == str(plain.errors)
+
+    calls = {path: node.calls for path, node in stats.nodes.items()}
+    assert calls == {
+        '': 1,
+        '[spec]': 1,
+        '[spec][containers]': 1,
+        '[spec][containers][*]': 2,
+        '[spec][containers][*][name]': 2,
+        '[spec][containers][*][image]': 2,
+        '[spec][containers][*][ports]': 2,
+        '[spec][containers][*][ports][*]': 3,
+    }
+
+    root = stats.nodes['']
+    assert root.time >= stats.nodes['[spec]'].time >= 0
+    assert 0 <= root.self_time <= root.time
+    assert stats.documents == 1
+    assert stats.validate_time >= root.time
+    assert stats.parse_time == stats.dump_time == 0
+
+
+def test_stats_accumulate():
+    documents = list()
+    stats = ValidationStats(callback=lambda s: documents.append(s.documents))
+
+    content = json.dumps(data)
+    ValidateFromJSON(template, io.StringIO(content), stats=stats)
+    ValidateFromBuffer(template, content.encode(), stats=stats)
+    lines = io.StringIO(f'{content}\n{content}\n')
+    assert len(list(ValidateFromJSONLines(template, lines, stats=stats))) == 2
+
+    assert documents == [1, 2, 3, 4]
+    assert stats.nodes['[spec][containers][*]'].calls == 8
+    assert stats.bytes == 3 * len(content) + 2
+    assert stats.parse_time > 0
+
+    stats.reset()
+    assert stats.documents == stats.bytes == 0
+    assert not stats.nodes
+
+
+def test_stats_lazy():
+    stats = ValidationStats()
+    valid = Validate(template, data, lazy=True, stats=stats)
+    assert stats.dump_time == 0
+    assert valid.data == Validate(template, data).data
+    assert stats.dump_time > 0
+
+
+def test_stats_report():
+    stats = ValidationStats()
+    Validate(template, data, stats=stats)
+    report = stats.report(limit=3)
+
+    assert report.startswith('1 documents')
+    assert len(report.splitlines()) == 5
+    assert str(stats) == stats.report()
+
+
+def test_stats_fail_fast():
+    stats = ValidationStats()
+    valid = Validate(template, data, fail_fast=True, stats=stats)
+    assert len(valid.errors) == 1
+
+    # The nodes that raised the error are recorded as well
+    assert stats.nodes['[spec][containers][*][ports][*]'].calls == 3
+    assert stats.documents == 1
+
+
+def test_stats_codegen():
+    with pytest.raises(InvalidTemplateConfiguration):
+        CompiledTemplate(template, 'codegen', stats=ValidationStats())
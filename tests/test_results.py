@@ -0,0 +1,232 @@
+import os
+import pickle
+
+import pytest
+
+from validit import (
+    Template,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    Options,
+    Cached,
+    ResultCache,
+    ValidateFromPath,
+)
+
+from validit.exceptions import ValidItError
+from validit.errors.parsing import YamlParsingError
+
+template = TemplateDict(
+    name=Template(str),
+    ports=TemplateList(Template(int)),
+    mode=Optional(Options('fast', 'safe'), default='safe'),
+)
+
+VALID = 'name: server\nports: [80, 443]\n'
+INVALID = 'name: 123\nports: [80, http]\nmode: slow\n'
+BROKEN = 'name: [server\n'
+
+
+@pytest.fixture(autouse=True)
+def key_path(tmp_path, monkeypatch):
+    """ Stores the default key of the result caches in a temporary
+    directory, instead of the home directory. """
+    path = tmp_path / 'home' / 'cache-key'
+    monkeypatch.setattr(ResultCache, 'KEY_PATH', str(path))
+    return path
+
+
+class Range(Template):
+    """ A template with its own arguments, that are part of its structure """
+
+    def __init__(self, lo, hi):
+        super().__init__(int)
+        self.lo, self.hi = lo, hi
+
+    def validate(self, container, errors):
+        super().validate(container, errors)
+        if not self.lo <= container.data <= self.hi:
+            errors.register_error(ValidItError('out of range'))
+
+
+class Opaque:
+    """ An argument that can only be compared by its identity """
+
+
+def test_fingerprint_is_stable():
+    same = TemplateDict(
+        name=Template(str),
+        ports=TemplateList(Template(int)),
+        mode=Optional(Options('fast', 'safe'), default='safe'),
+    )
+
+    assert template.fingerprint == same.fingerprint
+    assert pickle.loads(pickle.dumps(template)).fingerprint == \
+        template.fingerprint
+    assert Cached(template, maxsize=1).fingerprint == \
+        Cached(same, maxsize=2).fingerprint
+
+
+@pytest.mark.parametrize('other', [
+    TemplateDict(name=Template(str), ports=TemplateList(Template(int))),
+    TemplateDict(
+        name=Template(str, bytes),
+        ports=TemplateList(Template(int)),
+        mode=Optional(Options('fast', 'safe'), default='safe'),
+    ),
+    TemplateDict(
+        name=Template(str),
+        ports=TemplateList(Template(int), valid_lengths=range(3)),
+        mode=Optional(Options('fast', 'safe'), default='safe'),
+    ),
+    TemplateDict(
+        name=Template(str),
+        ports=TemplateList(Template(int)),
+        mode=Optional(Options('fast', 'safe'), default='fast'),
+    ),
+    TemplateDict(
+        name=Template(str),
+        ports=TemplateList(Template(int)),
+        mode=Optional(Options('fast', 'safe', 'slow'), default='safe'),
+    ),
+])
+def test_fingerprint_changes(other):
+    assert other.fingerprint != template.fingerprint
+
+
+def test_fingerprint_of_subclass_arguments():
+    assert Range(0, 100).fingerprint == Range(0, 100).fingerprint
+    assert Range(0, 100).fingerprint != Range(1, 65535).fingerprint
+
+
+def test_fingerprint_refuses_opaque_arguments():
+    with pytest.raises(ValidItError):
+        Options(Opaque()).fingerprint
+
+    with pytest.raises(ValidItError):
+        TemplateList(Template(int), valid_lengths=Opaque()).fingerprint
+
+
+@pytest.mark.parametrize('content', [VALID, INVALID, BROKEN])
+def test_result_cache(tmp_path, content, summary):
+    path = tmp_path / 'config.yaml'
+    path.write_text(content)
+    cache = ResultCache(tmp_path / 'cache')
+
+    expected = ValidateFromPath(template, path, title='config')
+    first = cache.validate(template, path, title='config')
+    second = cache.validate(template, path, title='config')
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert summary(first) == summary(second) == summary(expected)
+    assert str(second) == str(expected)
+
+    if content == BROKEN:
+        assert isinstance(second.errors.errors[0], YamlParsingError)
+
+
+def test_result_cache_invalidation(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text(VALID)
+    cache = ResultCache(tmp_path / 'cache')
+
+    cache.validate(template, path)
+    path.write_text(INVALID)
+    assert cache.validate(template, path).errors
+
+    other = TemplateDict(name=Template(str, int))
+    assert not cache.validate(other, path).errors
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_result_cache_corrupted_entry(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text(VALID)
+    cache = ResultCache(tmp_path / 'cache')
+    cache.validate(template, path)
+
+    for directory, _, files in os.walk(cache.directory):
+        for name in files:
+            with open(os.path.join(directory, name), 'wb') as file:
+                file.write(b'corrupted')
+
+    assert not cache.validate(template, path).errors
+    assert cache.validate(template, path).data == {
+        'name': 'server', 'ports': [80, 443], 'mode': 'safe',
+    }
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.clear()
+    assert not os.path.exists(cache.directory)
+
+
+def test_result_cache_opaque_template(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text(VALID)
+    cache = ResultCache(tmp_path / 'cache')
+
+    opaque = TemplateDict(name=Template(str), mode=Optional(Options(Opaque())))
+    assert not cache.validate(opaque, path).errors
+    assert not cache.validate(opaque, path).errors
+
+    # The results of the template are never stored
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert not os.path.exists(cache.directory)
+
+
+# Set when an entry is unpickled
+unpickled = list()
+
+
+class Payload:
+    """ An object that runs code when it is unpickled """
+
+    def __reduce__(self):
+        return (unpickled.append, ('unpickled',))
+
+
+def entries(directory):
+    for root, _, files in os.walk(directory):
+        for name in files:
+            yield os.path.join(root, name)
+
+
+def test_result_cache_refuses_unsigned_entries(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text(VALID)
+    cache = ResultCache(tmp_path / 'cache')
+    cache.validate(template, path)
+
+    # An attacker that can write to the directory replaces the entry
+    for entry in entries(cache.directory):
+        with open(entry, 'wb') as file:
+            file.write(b'\0' * 32 + pickle.dumps(Payload()))
+
+    assert not cache.validate(template, path).errors
+    assert not unpickled
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_result_cache_keys(tmp_path, key_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text(VALID)
+    directory = tmp_path / 'cache'
+
+    first = ResultCache(directory)
+    first.validate(template, path)
+    assert key_path.exists() and key_path.stat().st_mode & 0o077 == 0
+
+    # The default key is reused
+    second = ResultCache(directory)
+    second.validate(template, path)
+    assert second.hits == 1
+
+    # Entries that were stored using another key are ignored
+    other = ResultCache(directory, key='shared secret')
+    other.validate(template, path)
+    assert (other.hits, other.misses) == (0, 1)
+
+    same = ResultCache(directory, key=b'shared secret')
+    same.validate(template, path)
+    assert (same.hits, same.misses) == (1, 0)
@@ -0,0 +1,177 @@
+import io
+import json
+
+import pytest
+
+from validit import (
+    Template,
+    TemplateDict,
+    TemplateList,
+    Optional,
+    ValidateFromJSON,
+    ValidateFromJSONLines,
+    ValidateFromJSONStream,
+    ValidateFromYAMLStream,
+)
+
+from validit.errors import TemplateCheckInvalidDataError as WrongTypeError
+from validit.errors.parsing import JsonParsingError, YamlParsingError
+from validit.parsers import JsonBackend
+
+template = TemplateDict(
+    username=Template(str),
+    codes=TemplateList(Template(int)),
+)
+
+
+def test_json_lines():
+    fp = io.StringIO('\n'.join([
+        '{"username": "RealA10N", "codes": [1, 2], "other": null}',
+        '',
+        '{"username": 123, "codes": []}',
+        '{"username": "elonmusk", "codes": [',
+    ]))
+
+    results = list(ValidateFromJSONLines(template, fp, title='users.jsonl'))
+
+    assert [result.lineno for result in results] == [1, 3, 4]
+    assert results[0].data == {'username': 'RealA10N', 'codes': [1, 2]}
+    assert not results[0].errors
+
+    assert [type(e) for e in results[1].errors] == [WrongTypeError]
+    assert 'users.jsonl:3' in str(results[1])
+
+    error, = results[2].errors
+    assert isinstance(error, JsonParsingError)
+    assert error.pos[0] == 4
+
+
+def test_json_lines_unknown_column():
+    """ Parsers that don't report the position of the error only set the
+    line number. """
+
+    class PositionlessBackend(JsonBackend):
+        errors = (ValueError,)
+
+        def loads(self, text):
+            raise ValueError('Invalid document')
+
+    fp = io.StringIO('{}\n{}\n')
+    results = list(ValidateFromJSONLines(
+        template, fp, parser=PositionlessBackend()))
+
+    error, = results[1].errors
+    assert error.pos == (2, None)
+    assert error.msg == 'Failed to parse JSON file: Invalid document (line 2)'
+
+
+records = TemplateList(TemplateDict(
+    username=Template(str),
+    score=Template(int, float),
+    tags=TemplateList(Template(str), valid_lengths=range(3)),
+    nickname=Optional(Template(str)),
+))
+
+stream_documents = [
+    [],
+    [{'username': 'RealA10N', 'score': 12.5e10, 'tags': ['a', 'b']}],
+    [{'username': 'A', 'score': -1234567, 'tags': [], 'other': {'x': [1, 2]}},
+     {'username': 1, 'score': 'high', 'tags': ['a', 2], 'nickname': None},
+     {'tags': 'none'},
+     'string',
+     {'username': 'B', 'score': 1, 'tags': ['a"]},', '\\u1234 ✓']}],
+    {'username': 'not a list'},
+    None,
+]
+
+
+@pytest.mark.parametrize('chunk_size', (1, 3, 7, 2 ** 16))
+@pytest.mark.parametrize('document', stream_documents)
+def test_json_stream_matches(document, chunk_size):
+    text = json.dumps(document, indent=2)
+
+    expected = ValidateFromJSON(records, io.StringIO(text))
+    got = ValidateFromJSONStream(records, io.StringIO(text), chunk_size=chunk_size)
+
+    assert [(type(e), e.path, e.msg) for e in got.errors] == \
+        [(type(e), e.path, e.msg) for e in expected.errors]
+
+
+def test_json_stream_list_length():
+    text = json.dumps([{'username': 'A', 'score': 1, 'tags': ['a'] * 3}])
+    got = ValidateFromJSONStream(records, io.StringIO(text), chunk_size=5)
+    assert [e.path for e in got.errors] == [(0, 'tags')]
+
+
+@pytest.mark.parametrize('text', (
+    '{"username": "A", "codes": ["x", 2], "codes": [1]}',
+    '{"username": 1, "codes": [], "username": "A"}',
+    '{"codes": [1], "username": "A", "codes": "x"}',
+))
+def test_json_stream_duplicate_keys(text):
+    """ Only the last occurrence of a duplicate key is validated, just
+    like it is the only one that `json.load` keeps. """
+
+    expected = ValidateFromJSON(template, io.StringIO(text))
+    got = ValidateFromJSONStream(template, io.StringIO(text), chunk_size=4)
+
+    assert [(e.path, e.msg) for e in got.errors] == \
+        [(e.path, e.msg) for e in expected.errors]
+
+
+def test_json_stream_max_errors():
+    text = json.dumps({'username': 1, 'codes': ['x'] * 50})
+    got = ValidateFromJSONStream(template, io.StringIO(text), max_errors=5)
+
+    assert len(got.errors) == 51
+    assert [e.path for e in got.errors] == \
+        [('username',)] + [('codes', index) for index in range(4)]
+    assert got.errors.omitted_paths == {'[codes][*]': 46}
+
+
+@pytest.mark.parametrize('chunk_size', (1, 4, 2 ** 16))
+@pytest.mark.parametrize('text', (
+    '[{"username": "A", "score": 1, "tags": []},\n {"username": x}]',
+    '[\n\n{"username": "A" "score": 1}]',
+    '[{"username": "A", "score": 1, "tags": []}] extra',
+    '[{"username": "A", "score": 1, "tags": [',
+    '{"username": "unterminated',
+))
+def test_json_stream_parsing_error(text, chunk_size):
+    with pytest.raises(json.JSONDecodeError) as einfo:
+        json.loads(text)
+
+    got = ValidateFromJSONStream(records, io.StringIO(text), chunk_size=chunk_size)
+    error = list(got.errors)[-1]
+
+    assert isinstance(error, JsonParsingError)
+    assert error.pos == (einfo.value.lineno, einfo.value.colno)
+
+
+@pytest.mark.parametrize('parser', ('pyyaml', None))
+def test_yaml_stream(parser):
+    pytest.importorskip('yaml')
+
+    fp = io.StringIO('\n'.join([
+        'username: RealA10N',
+        'codes: [1, 2]',
+        '---',
+        'username: 123',
+        'codes: []',
+        '---',
+        'username: [unclosed',
+        '---',
+        'username: never loaded',
+    ]))
+
+    results = list(ValidateFromYAMLStream(
+        template, fp, title='users.yaml', parser=parser))
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert results[0].data == {'username': 'RealA10N', 'codes': [1, 2]}
+    assert not results[0].errors
+
+    assert [type(e) for e in results[1].errors] == [WrongTypeError]
+    assert 'users.yaml#1' in str(results[1])
+
+    assert [type(e) for e in results[2].errors] == [YamlParsingError]
@@ -1,4 +1,7 @@
+import gc
 import pytest
+import pickle
+import linecache
 import typing
 from dataclasses import dataclass
 
@@ -9,17 +12,24 @@ from validit import (
     TemplateAny,
     Optional,
     Options,
+    Validate,
+    is_valid,
 )
 
 from validit.templates import BaseTemplate
+from validit.compiler import CompiledTemplate
 
-from validit.errors.managers import TemplateCheckRaiseOnError
+from validit.errors.managers import (
+    TemplateCheckRaiseOnError,
+    TemplateCheckErrorCollection,
+)
 from validit.errors import (
     TemplateCheckError,
     TemplateCheckInvalidOptionError as InvalidOptionError,
     TemplateCheckInvalidDataError as WrongTypeError,
     TemplateCheckMissingDataError as MissingDataError,
     TemplateCheckListLengthError as ListLengthError,
+    TemplateCheckErrorRecord,
 )
 
 from validit.utils import DefaultValue
@@ -337,6 +347,49 @@ tests = CollectionTest([
             CheckGroup(['hello', 123, None], error=InvalidOptionError)
         ],
     ),
+    TemplateTest(
+        name='options-equality',
+        template=Options(10 ** 20, 'country', [1, 2], {'code': 'USD'}),
+        checks=[
+            CheckGroup([
+                int('1' + '0' * 20),
+                ''.join(['coun', 'try']),
+                [1, 2],
+                {'code': 'USD'},
+            ]),
+            CheckGroup([
+                10 ** 20 + 1,
+                'Country',
+                [2, 1],
+                (1, 2),
+                {'code': 'EUR'},
+                DefaultValue,
+            ], error=InvalidOptionError),
+        ],
+    ),
+    TemplateTest(
+        name='options-numeric-types',
+        template=Options(True, 0, 2.5),
+        checks=[
+            CheckGroup([True, 0, 2.5]),
+            CheckGroup([
+                1,
+                1.0,
+                False,
+                0.0,
+                0j,
+                '0',
+            ], error=InvalidOptionError),
+        ],
+    ),
+    TemplateTest(
+        name='options-many',
+        template=Options(*(f'SKU-{index}' for index in range(5000))),
+        checks=[
+            CheckGroup(['SKU-0', 'SKU-2500', 'SKU-4999']),
+            CheckGroup(['SKU-5000', 'sku-0', 0], error=InvalidOptionError),
+        ],
+    ),
 ])
 
 
@@ -365,3 +418,327 @@ def test_check_first_error(test: SingleTest):
                     error.msg,
                 ])
             )
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+@pytest.mark.parametrize('test', tests.to_single_tests())
+def test_compiled_first_error(test: SingleTest, backend: str):
+
+    compiled = CompiledTemplate(test.template, backend)
+
+    if test.check.error is None:
+        compiled.dump(test.check.data, TemplateCheckRaiseOnError())
+
+    else:
+        with pytest.raises(test.check.error) as einfo:
+            compiled.dump(test.check.data, TemplateCheckRaiseOnError())
+
+        error: TemplateCheckError = einfo.value
+        if test.check.msg is not None and error.msg != test.check.msg:
+            pytest.fail(f'Unexpected message: {error.msg}')
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+@pytest.mark.parametrize('test', tests.to_single_tests())
+def test_compiled_matches_validate(test: SingleTest, backend: str):
+    """ Test that the compiled template registers the same errors, in the same
+    order and with the same paths, as the regular validation. """
+
+    expected = TemplateCheckErrorCollection()
+    test.template.validate(HeadContainer(test.check.data), expected)
+
+    got = TemplateCheckErrorCollection()
+    CompiledTemplate(test.template, backend).dump(test.check.data, got)
+
+    assert [(type(e), e.path, e.msg) for e in got] == \
+        [(type(e), e.path, e.msg) for e in expected]
+
+
+class EvenNumber(Template):
+    """ A user defined template that doesn't know how to compile itself. """
+
+    def __init__(self,):
+        super().__init__(int)
+
+    def validate(self, container, errors):
+        super().validate(container, errors)
+        if isinstance(container.data, int) and container.data % 2:
+            errors.register_error(TemplateCheckError(container, 'Odd number'))
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+def test_compiled_user_template(backend):
+    template = TemplateDict(numbers=TemplateList(EvenNumber()))
+    errors = TemplateCheckErrorCollection()
+    CompiledTemplate(template, backend).dump({'numbers': [2, 3, 4]}, errors)
+
+    assert [(e.path, e.msg) for e in errors] == [(('numbers', 1), 'Odd number')]
+
+
+class Range(Template):
+    """ A user defined template with its own arguments. """
+
+    def __init__(self, lo, hi):
+        super().__init__(int)
+        self.lo, self.hi = lo, hi
+
+    def validate(self, container, errors):
+        super().validate(container, errors)
+        if isinstance(container.data, int) and \
+                not self.lo <= container.data <= self.hi:
+            errors.register_error(TemplateCheckError(container, 'Out of range'))
+
+
+class SlottedRange(Range):
+    """ Stores its arguments in slots, instead of the instance dictionary. """
+
+    __slots__ = ('__lo', 'hi')
+
+    def __init__(self, lo, hi):
+        Template.__init__(self, int)
+        self.__lo, self.hi = lo, hi
+
+    @property
+    def lo(self):
+        return self.__lo
+
+
+class LooseRange(Range):
+    """ A template that claims to be equal to any other range. """
+
+    def _structure(self,):
+        return (LooseRange,)
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+@pytest.mark.parametrize('cls', [Range, SlottedRange, LooseRange])
+def test_compiled_user_template_arguments(backend, cls):
+    template = TemplateDict(percent=cls(0, 100), port=cls(1, 65535))
+    assert (template.template['percent'] == template.template['port']) is \
+        (cls is LooseRange)
+
+    # Each template is compiled into its own step, even if it is equal to
+    # another template
+    errors = TemplateCheckErrorCollection()
+    CompiledTemplate(template, backend).dump({'percent': 50, 'port': 8080},
+                                             errors)
+    assert not errors
+    assert is_valid(template, {'percent': 50, 'port': 8080})
+    assert not is_valid(template, {'percent': 101, 'port': 8080})
+
+
+def test_compiled_deep_template():
+    """ Test that templates that are nested deeper than the generated code
+    can handle are still compiled correctly. """
+
+    template, data = Template(int), 'deep'
+    for _ in range(50):
+        template, data = TemplateList(template), [data]
+
+    errors = TemplateCheckErrorCollection()
+    assert template.compile().dump(data, errors) == data
+    assert [e.path for e in errors] == [(0,) * 50]
+
+
+def test_generated_source_is_released():
+    """ Test that the generated source code is kept for tracebacks only as
+    long as the compiled template exists. """
+
+    compiled = CompiledTemplate(TemplateList(Template(int)))
+    filename = compiled._dump.__code__.co_filename
+    assert filename in linecache.cache
+
+    del compiled
+    gc.collect()
+    assert filename not in linecache.cache
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+@pytest.mark.parametrize('container', ['list', 'dict'])
+def test_very_deep_template(backend, container):
+    """ Test that templates that are nested as deep as the data that the
+    interpreter can validate are compiled without reaching the recursion
+    limit. """
+
+    template, data = Template(int), 'deep'
+    for _ in range(400):
+        if container == 'list':
+            template, data = TemplateList(template), [data]
+        else:
+            template, data = TemplateDict(key=template), {'key': data}
+
+    errors = TemplateCheckErrorCollection()
+    assert CompiledTemplate(template, backend).dump(data, errors) == data
+    assert len(errors) == 1 and len(errors.errors[0].path) == 400
+    assert not CompiledTemplate(template, backend).test(data)
+    assert template.fingerprint
+
+
+def test_lazy_error_messages():
+    """ Test that error messages are generated only when they are needed. """
+
+    class CountRepr:
+        calls = 0
+
+        def __repr__(self,):
+            CountRepr.calls += 1
+            return 'CountRepr'
+
+    errors = TemplateCheckErrorCollection()
+    Options('yes', 'no').compile().dump(CountRepr(), errors)
+
+    assert errors and CountRepr.calls == 0
+    assert errors.errors[0].msg == "Expected 'yes' or 'no' but got CountRepr"
+    str(errors), str(errors)
+    assert CountRepr.calls == 1
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+def test_error_records(backend):
+    """ Test that error collections store compact error records, and
+    create the error objects only when they are accessed. """
+
+    template = TemplateDict(values=TemplateList(Template(int)))
+    data = {'values': [1, 'two', 3.0]}
+    compiled = CompiledTemplate(template, backend)
+
+    errors = TemplateCheckErrorCollection()
+    compiled.dump(data, errors)
+
+    assert len(errors) == 2
+    assert all(isinstance(record, TemplateCheckErrorRecord)
+               for record in errors._errors)
+    assert [record.path for record in errors._errors] == \
+        [('values', 1), ('values', 2)]
+
+    # Records are converted only once, and survive pickling
+    copied = pickle.loads(pickle.dumps(errors))
+    first = list(errors)
+    assert list(errors) == first
+    assert [type(error) for error in first] == [WrongTypeError] * 2
+    assert [str(error) for error in copied] == [str(e) for e in first]
+
+    # Managers that don't store errors receive error objects
+    with pytest.raises(WrongTypeError) as info:
+        compiled.dump(data, TemplateCheckRaiseOnError())
+    assert info.value.path == ('values', 1)
+
+
+def test_errors_list():
+    """ Test that `errors` is a single list, which can be modified. """
+
+    compiled = TemplateList(Template(int)).compile()
+    errors = TemplateCheckErrorCollection()
+    compiled.dump(['one'], errors)
+
+    assert errors.errors is errors.errors
+    assert [type(error) for error in errors.errors] == [WrongTypeError]
+
+    # Records registered after the list was read are converted as well
+    compiled.dump([1, 'two'], errors)
+    assert [type(error) for error in errors.errors] == [WrongTypeError] * 2
+
+    errors.errors.append(TemplateCheckError(msg='appended'))
+    assert len(errors) == 3 and list(errors)[-1].msg == 'appended'
+
+
+@pytest.mark.parametrize('aggregate', [True, False])
+def test_max_errors(aggregate):
+    template = TemplateDict(
+        items=TemplateList(TemplateDict(price=Template(int))),
+        name=Template(str),
+    )
+    data = {'items': [{'price': 'free'}] * 1000 + [{}] * 5}
+
+    errors = TemplateCheckErrorCollection(max_errors=10, aggregate=aggregate)
+    template.compile().dump(data, errors)
+
+    assert len(errors) == errors.count == 1006
+    assert errors.omitted == 996
+    assert len(list(errors)) == 10
+
+    if aggregate:
+        assert errors.omitted_paths == {
+            '[items][*][price]': 995,
+            '[name]': 1,
+        }
+    else:
+        assert errors.omitted_paths == {}
+
+    # The stored errors, and a summary of the omitted errors
+    assert len(str(errors).splitlines()) == 10 + (2 if aggregate else 1)
+
+
+def test_max_errors_validate():
+    template = TemplateList(Template(int))
+    valid = Validate(template, ['x'] * 100, max_errors=3)
+
+    assert len(valid.errors) == 100
+    assert [error.path for error in valid.errors] == [(0,), (1,), (2,)]
+    assert str(valid.errors).endswith('97 more errors\x1b[0m')
+
+    # Omitted errors are counted when the errors are moved
+    destination = TemplateCheckErrorCollection()
+    valid.errors.dump_errors(destination)
+    assert destination.count == 100 and len(list(destination)) == 3
+    assert destination.omitted_paths == {'[*]': 97}
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+@pytest.mark.parametrize('test', tests.to_single_tests())
+def test_compiled_test(test: SingleTest, backend: str):
+    compiled = CompiledTemplate(test.template, backend)
+    assert compiled.test(test.check.data) is (test.check.error is None)
+
+
+@pytest.mark.parametrize('test', tests.to_single_tests())
+def test_fail_fast(test: SingleTest):
+    full = Validate(test.template, test.check.data)
+    fast = Validate(test.template, test.check.data, fail_fast=True)
+
+    assert is_valid(test.template, test.check.data) is (not full.errors)
+    assert [e.msg for e in fast.errors] == [e.msg for e in full.errors][:1]
+
+
+@pytest.mark.parametrize('backend', CompiledTemplate.BACKENDS)
+@pytest.mark.parametrize('test', tests.to_single_tests())
+def test_compiled_check(test: SingleTest, backend: str):
+    compiled = CompiledTemplate(test.template, backend)
+
+    expected = TemplateCheckErrorCollection()
+    compiled.dump(test.check.data, expected)
+
+    got = TemplateCheckErrorCollection()
+    assert compiled.check(test.check.data, got) is None
+    assert [(type(e), e.path, e.msg) for e in got] == \
+        [(type(e), e.path, e.msg) for e in expected]
+
+
+@pytest.mark.parametrize('test', tests.to_single_tests())
+def test_lazy_validate(test: SingleTest):
+    full = Validate(test.template, test.check.data)
+    lazy = Validate(test.template, test.check.data, lazy=True)
+
+    assert [e.msg for e in lazy.errors] == [e.msg for e in full.errors]
+
+    # `TemplateAny` may copy objects, so the dumped objects are compared by
+    # their content and not by their identity
+    assert pickle.dumps(lazy.data) == pickle.dumps(full.data)
+
+
+def test_lazy_validate_dumps_on_access():
+
+    class CountCopies:
+        copies = 0
+
+        def __deepcopy__(self, memo):
+            CountCopies.copies += 1
+            return CountCopies()
+
+    template = TemplateDict(value=TemplateAny(copy='deep'))
+    valid = Validate(template, {'value': CountCopies()}, lazy=True)
+
+    assert not valid.errors and CountCopies.copies == 0
+    assert isinstance(valid.data['value'], CountCopies)
+    valid.data
+    assert CountCopies.copies == 1
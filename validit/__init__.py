@@ -5,15 +5,28 @@ from .templates import (
     TemplateList,
     Optional,
     Options,
+    Cached,
 )
 
 from .validate import (
     Validate,
     ValidateFromJSON,
+    ValidateFromJSONLines,
+    ValidateFromJSONStream,
     ValidateFromYAML,
+    ValidateFromYAMLStream,
     ValidateFromTOML,
+    ValidateFromBuffer,
+    ValidateFromPath,
+    is_valid,
 )
 
+from .batch import validate_many
+from .aio import avalidate, AsyncValidateFromJSON
+from .results import ResultCache
+from .interning import intern_template
+from .profiling import ValidationStats
+
 __all__ = [
     'Template',
     'TemplateAny',
@@ -21,10 +34,23 @@ __all__ = [
     'TemplateList',
     'Optional',
     'Options',
+    'Cached',
     'Validate',
     'ValidateFromJSON',
+    'ValidateFromJSONLines',
+    'ValidateFromJSONStream',
     'ValidateFromYAML',
+    'ValidateFromYAMLStream',
     'ValidateFromTOML',
+    'ValidateFromBuffer',
+    'ValidateFromPath',
+    'is_valid',
+    'validate_many',
+    'avalidate',
+    'AsyncValidateFromJSON',
+    'ResultCache',
+    'intern_template',
+    'ValidationStats',
 ]
 
 __version__ = '1.3.2'
@@ -0,0 +1,271 @@
+import typing
+import asyncio
+import functools
+
+from concurrent.futures import Executor
+
+from validit.compiler import defines_compile_method
+from validit.templates.base import BaseTemplate
+from validit.templates.templates import TemplateDict, TemplateList
+from validit.utils import DefaultValue
+
+from validit.errors import TemplateCheckError, TemplateCheckListLengthError
+from validit.errors.managers import (
+    TemplateCheckErrorManager as ErrorManager,
+    TemplateCheckErrorCollection as ErrorCollection,
+    TemplateCheckRaiseOnError as RaiseOnErrorManager,
+)
+
+from validit.parsers import ParserBackend, get_parser
+from validit.validate import Validate, ValidateFromFile, ValidateInformation
+
+
+class AsyncValidator:
+    """ Validates data inside a coroutine, without blocking the event loop for
+    long. Lists that correspond to a `TemplateList` are validated in chunks
+    of elements, and the validator yields control to the event loop after
+    every `chunk_size` validated elements. Values of dictionaries that
+    correspond to a `TemplateDict`, and elements of lists whose element
+    template is a `TemplateList` or a `TemplateDict`, are walked the same
+    way, so large lists nested anywhere in the data are split into chunks as
+    well.
+
+    The registered errors and the dumped data are the same as the results of
+    a regular validation. """
+
+    def __init__(self, errors: ErrorManager, chunk_size: int = 1000) -> None:
+        self._errors = errors
+        self._chunk_size = chunk_size
+        self._pending = 0
+
+    @staticmethod
+    def _walks(template: BaseTemplate, cls: type) -> bool:
+        return (isinstance(template, cls)
+                and defines_compile_method(template, '_compile_dump'))
+
+    async def _tick(self, count: int) -> None:
+        """ Yields to the event loop if enough elements were validated since
+        the last time it yielded. """
+
+        self._pending += count
+        if self._pending >= self._chunk_size:
+            self._pending = 0
+            await asyncio.sleep(0)
+
+    async def validate(self,
+                       template: BaseTemplate,
+                       data: typing.Any,
+                       ) -> typing.Any:
+        """ Validates the given data using the given template, and returns
+        the dumped data. """
+        return await self._value(template, data, None)
+
+    async def _value(self,
+                     template: BaseTemplate,
+                     data: typing.Any,
+                     link: typing.Any,
+                     ) -> typing.Any:
+
+        if (isinstance(data, (list, tuple))
+                and self._walks(template, TemplateList)):
+            return await self._list(template, data, link)
+
+        if (isinstance(data, dict)
+                and self._walks(template, TemplateDict)):
+            return await self._dict(template, data, link)
+
+        return template.compile().dump(data, self._errors, link)
+
+    async def _list(self,
+                    template: TemplateList,
+                    data: typing.Union[list, tuple],
+                    link: typing.Any,
+                    ) -> list:
+
+        errors = self._errors
+        if len(data) not in template.length:
+            errors.register(
+                TemplateCheckListLengthError, data, link,
+                expected=template.length, got=len(data),
+            )
+
+        element_template = template.template
+        dumped = list()
+
+        if (self._walks(element_template, TemplateList)
+                or self._walks(element_template, TemplateDict)):
+            # The elements may contain large lists themselves, so each
+            # element is walked separately
+            for index, cur in enumerate(data):
+                dumped.append(await self._value(
+                    element_template, cur, (link, index)))
+                await self._tick(1)
+
+            return dumped
+
+        element = element_template.compile()
+        for start in range(0, len(data), self._chunk_size):
+            chunk = data[start:start + self._chunk_size]
+            dumped.extend(
+                element.dump(cur, errors, (link, index))
+                for index, cur in enumerate(chunk, start)
+            )
+            await self._tick(len(chunk))
+
+        return dumped
+
+    async def _dict(self,
+                    template: TemplateDict,
+                    data: dict,
+                    link: typing.Any,
+                    ) -> dict:
+
+        dumped = dict()
+        for key, element in template.template.items():
+            value = await self._value(
+                element, data.get(key, DefaultValue), (link, key))
+            if value is not DefaultValue:
+                dumped[key] = value
+
+        return dumped
+
+
+def _size(data: typing.Any) -> int:
+    return len(data) if isinstance(data, (list, tuple, dict)) else 0
+
+
+def _validate_sync(template: BaseTemplate,
+                   data: typing.Any,
+                   fail_fast: bool,
+                   ) -> typing.Tuple[ErrorCollection, typing.Any]:
+    """ Validates the data in an executor, and returns the errors and the
+    dumped data. """
+
+    result = Validate(template, data, fail_fast)
+    return result.errors, result.data
+
+
+def _parse_sync(backend: ParserBackend,
+                content: typing.Union[str, bytes],
+                ) -> ValidateInformation:
+    """ Parses the content of a file (possibly in an executor), and returns
+    the information object of the parsed data. """
+
+    if isinstance(content, str):
+        load = functools.partial(backend.loads, content)
+    else:
+        load = functools.partial(backend.loads_buffer, content)
+
+    return ValidateFromFile._parse(backend, load)
+
+
+async def _validate(template: BaseTemplate,
+                    info: ValidateInformation,
+                    fail_fast: bool,
+                    chunk_size: int,
+                    executor: typing.Optional[Executor],
+                    threshold: int,
+                    ) -> None:
+    """ Validates the data stored in the given information object, and
+    stores the errors and the dumped data in it. """
+
+    info.validated = True
+
+    if executor is not None and _size(info.data) >= threshold:
+        loop = asyncio.get_event_loop()
+        info.errors, info.dumped = await loop.run_in_executor(
+            executor,
+            functools.partial(_validate_sync, template, info.data, fail_fast),
+        )
+        return
+
+    errors = RaiseOnErrorManager() if fail_fast else info.errors
+    validator = AsyncValidator(errors, chunk_size)
+
+    try:
+        info.dumped = await validator.validate(template, info.data)
+
+    except TemplateCheckError as error:
+        if not fail_fast:
+            raise
+        info.errors.register_error(error)
+
+
+async def avalidate(template: BaseTemplate,
+                    data: typing.Any,
+                    fail_fast: bool = False,
+                    chunk_size: int = 1000,
+                    executor: Executor = None,
+                    threshold: int = 10000,
+                    ) -> Validate:
+    """ Validate the given data with the given template inside a coroutine,
+    and return the same results as `Validate`. Large lists are validated in
+    chunks of `chunk_size` elements, and control is given back to the event
+    loop between the chunks.
+
+    If an `executor` (a thread or a process pool) is given, data that
+    contains at least `threshold` elements in its top level is validated in
+    the executor instead. Using a process pool, the template and the data
+    must be picklable. """
+
+    info = ValidateInformation(data=data)
+    await _validate(template, info, fail_fast, chunk_size, executor, threshold)
+    return Validate(template, info)
+
+
+class AsyncValidateFromJSON:
+
+    def __init__(self,
+                 template: BaseTemplate,
+                 stream: typing.Any,
+                 title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 chunk_size: int = 1000,
+                 executor: Executor = None,
+                 threshold: int = 10000,
+                 ) -> None:
+        """ Validate data from a JSON document that is read from an
+        asynchronous stream: any object with a `read` coroutine method, like
+        `asyncio.StreamReader`. Awaiting this object reads the whole stream,
+        parses it and validates it (see `avalidate`), and returns the results
+        as a `ValidateFromFile` object. If an `executor` is given, documents
+        of at least `threshold` bytes are parsed in the executor as well, so
+        parsing them doesn't block the event loop:
+
+        >>> valid = await AsyncValidateFromJSON(template, reader)
+        """
+
+        self._backend = get_parser('json', parser)
+        self._template = template
+        self._stream = stream
+        self._title = title
+        self._fail_fast = fail_fast
+        self._chunk_size = chunk_size
+        self._executor = executor
+        self._threshold = threshold
+
+    def __await__(self,) -> typing.Generator[None, None, ValidateFromFile]:
+        return self._validate().__await__()
+
+    async def _validate(self,) -> ValidateFromFile:
+        backend = self._backend
+        content = await self._stream.read()
+
+        if self._executor is not None and len(content) >= self._threshold:
+            loop = asyncio.get_event_loop()
+            info = await loop.run_in_executor(
+                self._executor,
+                functools.partial(_parse_sync, backend, content),
+            )
+        else:
+            info = _parse_sync(backend, content)
+
+        if not info.fatal_error:
+            await _validate(
+                self._template, info, self._fail_fast,
+                self._chunk_size, self._executor, self._threshold,
+            )
+
+        return ValidateFromFile(
+            self._template, info, self._title, self._fail_fast)
@@ -0,0 +1,191 @@
+import sys
+import typing
+import itertools
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from termcolor import colored
+
+from validit.errors.errors import TemplateCheckError
+from validit.errors.managers import (
+    TemplateCheckErrorCollection as ErrorCollection,
+    TemplateCheckRaiseOnError as RaiseOnErrorManager,
+)
+from validit.templates.base import BaseTemplate
+
+
+class BatchResults:
+    """ The results of validating many documents with the same template.
+    Stores a single flag for each document, and an error collection only for
+    the documents that don't follow the template. """
+
+    def __init__(self,) -> None:
+        self._valid = bytearray()
+        self._errors = dict()
+
+    def __len__(self,) -> int:
+        """ Returns the number of validated documents. """
+        return len(self._valid)
+
+    def __getitem__(self, index: int) -> bool:
+        """ Returns `True` only if the document in the given index follows the
+        template. """
+        return bool(self._valid[index])
+
+    def __iter__(self,) -> typing.Iterator[bool]:
+        """ Yields `True` or `False` for each document, in the order in which
+        the documents were validated. """
+        return (bool(valid) for valid in self._valid)
+
+    def __str__(self,) -> str:
+        """ Returns a colored string that shows the errors of all the invalid
+        documents. """
+
+        return '\n'.join(
+            colored(f'[#{index}]', 'cyan') + ' ' + line
+            for index, errors in self._errors.items()
+            for line in str(errors).splitlines()
+        )
+
+    @property
+    def errors(self,) -> typing.Dict[int, ErrorCollection]:
+        """ A dictionary that maps the index of each invalid document to the
+        errors found in it. Empty if all of the documents are valid. """
+        return self._errors
+
+    def register(self, errors: ErrorCollection = None) -> None:
+        """ Registers the results of the next document. If the document
+        is invalid, the errors found in it should be provided. """
+
+        if errors:
+            self._errors[len(self._valid)] = errors
+            self._valid.append(False)
+        else:
+            self._valid.append(True)
+
+    def extend(self, other: 'BatchResults') -> None:
+        """ Appends the results of another batch after the results of the
+        current one. """
+
+        offset = len(self._valid)
+        self._valid.extend(other._valid)
+        self._errors.update(
+            (offset + index, errors)
+            for index, errors in other._errors.items()
+        )
+
+
+# The template used by the current worker process. The template is sent to
+# each worker only once, when the worker starts.
+_worker_template = None
+
+
+def _init_worker(template: BaseTemplate) -> None:
+    global _worker_template
+    _worker_template = template
+
+
+def _validate_chunk(documents: typing.List[typing.Any],
+                    fail_fast: bool,
+                    template: BaseTemplate = None,
+                    ) -> BatchResults:
+    if template is None:
+        template = _worker_template
+    return validate_many(template, documents, fail_fast)
+
+
+def _chunks(iterable: typing.Iterable, size: int) -> typing.Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_many(template: BaseTemplate,
+                  documents: typing.Iterable[typing.Any],
+                  fail_fast: bool = False,
+                  workers: int = None,
+                  chunk_size: int = 1000,
+                  ) -> BatchResults:
+    """ Validates each of the given documents with the given template.
+    The documents are first checked using the fast `is_valid` check, and the
+    errors are collected only for the documents that don't follow the
+    template. If `fail_fast` is set, only the first error of each invalid
+    document is collected.
+
+    If `workers` is greater than one, the documents are split into chunks of
+    `chunk_size` documents, which are validated in a pool of worker
+    processes. The template is sent to each worker only once, and the results
+    are returned in the order of the given documents. The documents, the
+    template and the errors must be picklable. """
+
+    if workers is not None and workers > 1:
+        return _validate_parallel(
+            template, documents, fail_fast, workers, chunk_size)
+
+    compiled = template.compile()
+    results = BatchResults()
+
+    for document in documents:
+        if compiled.test(document):
+            results.register()
+            continue
+
+        # Only the errors are needed, so the document is checked without
+        # dumping it
+        errors = ErrorCollection()
+        try:
+            compiled.check(
+                document, RaiseOnErrorManager() if fail_fast else errors)
+        except TemplateCheckError as error:
+            if not fail_fast:
+                raise
+            errors.register_error(error)
+
+        results.register(errors)
+
+    return results
+
+
+def _validate_parallel(template: BaseTemplate,
+                       documents: typing.Iterable[typing.Any],
+                       fail_fast: bool,
+                       workers: int,
+                       chunk_size: int,
+                       ) -> BatchResults:
+    """ Validates the documents in a pool of worker processes. Only a limited
+    number of chunks is sent to the workers at once, so long streams of
+    documents are not loaded into memory all at once. """
+
+    results = BatchResults()
+    pending = deque()
+
+    if sys.version_info >= (3, 7):
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(template,),
+        )
+        extra = ()
+
+    else:
+        # Worker initializers are not supported in Python 3.6,
+        # so the template is sent with each chunk instead.
+        pool = ProcessPoolExecutor(max_workers=workers)
+        extra = (template,)
+
+    with pool as executor:
+
+        for chunk in _chunks(documents, chunk_size):
+            pending.append(executor.submit(
+                _validate_chunk, chunk, fail_fast, *extra))
+
+            if len(pending) >= 2 * workers:
+                results.extend(pending.popleft().result())
+
+        while pending:
+            results.extend(pending.popleft().result())
+
+    return results
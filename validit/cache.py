@@ -0,0 +1,91 @@
+import typing
+
+from collections import OrderedDict
+
+from validit.errors.errors import TemplateCheckError
+from validit.errors.managers import TemplateCheckErrorManager as ErrorManager
+
+if typing.TYPE_CHECKING:
+    from validit.compiler import Step
+    from validit.templates.base import BaseTemplate
+
+
+class _CountErrors(ErrorManager):
+    """ Passes the registered errors to another error manager, and counts
+    them. """
+
+    def __init__(self, errors: ErrorManager) -> None:
+        self.errors = errors
+        self.count = 0
+
+    def register_error(self, error: TemplateCheckError) -> None:
+        self.count += 1
+        self.errors.register_error(error)
+
+    def register(self, error_type, data, link, expected=None, got=None):
+        self.count += 1
+        self.errors.register(error_type, data, link, expected, got)
+
+
+class ValidationCache:
+    """ Remembers the dumped data of subtrees that were already validated, and
+    found to be valid. The subtrees are identified by the template and by the
+    identity of the data object (and not by its content), so the same object
+    that appears many times in a document (for example, using YAML anchors)
+    is validated only once.
+
+    The cache holds a reference to each cached object, so objects are never
+    confused with newer objects that reuse their identity. However, cached
+    objects shouldn't be modified: a modified object is not validated again.
+    When more than `maxsize` subtrees are cached, the least recently used
+    subtree is dropped. """
+
+    def __init__(self, maxsize: typing.Optional[int] = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self,) -> int:
+        """ Returns the number of cached subtrees. """
+        return len(self._entries)
+
+    def __reduce__(self,):
+        # The cached objects are not sent with the cache
+        return (type(self), (self.maxsize,))
+
+    def clear(self,) -> None:
+        """ Drops all of the cached subtrees. """
+        self._entries.clear()
+
+    def wrap(self, template: 'BaseTemplate', dump: 'Step') -> 'Step':
+        """ Wraps the given compiled step of the given template with a step
+        that looks up the data in the cache before it is validated. """
+
+        entries = self._entries
+        template_id = id(template)
+
+        def step(data, link, errors):
+            if not isinstance(data, (dict, list, tuple)):
+                return dump(data, link, errors)
+
+            key = (template_id, id(data))
+            entry = entries.get(key)
+
+            if entry is not None and entry[0] is data:
+                self.hits += 1
+                entries.move_to_end(key)
+                return entry[1]
+
+            self.misses += 1
+            counter = _CountErrors(errors)
+            dumped = dump(data, link, counter)
+
+            if not counter.count:
+                entries[key] = (data, dumped)
+                if self.maxsize is not None and len(entries) > self.maxsize:
+                    entries.popitem(last=False)
+
+            return dumped
+
+        return step
@@ -0,0 +1,194 @@
+import typing
+import itertools
+import linecache
+import weakref
+
+from contextlib import contextmanager
+
+from validit.utils import DefaultValue
+
+if typing.TYPE_CHECKING:
+    from validit.compiler import Compiler, Step
+    from validit.templates.base import BaseTemplate
+
+
+class SourceGenerator:
+    """ Generates the source code of a single Python function that dumps and
+    validates data according to a template tree. All of the type checks, key
+    lookups and loops are inlined into the function, so running it doesn't
+    call any other function for the built-in templates.
+
+    Templates generate their own code using the `_generate_code` method. If a
+    template doesn't know how to generate code, or if the generated code is
+    nested too deeply, the generated function calls the compiled step of the
+    template instead. Templates whose results are cached are also validated
+    by calling their compiled step.
+
+    In the `'dump'` mode, the generated function recives the data, a linked
+    path and an error manager, registers the errors and returns the dumped
+    data. The `'check'` mode is the same, but the generated function doesn't
+    dump the data and returns nothing. In the `'test'` mode, the generated
+    function recives only the data and returns `False` as soon as it finds a
+    mismatch, without creating any error objects or dumping the data. """
+
+    MODES = ('dump', 'check', 'test')
+
+    # Python limits the number of nested blocks (and indentation levels) in
+    # a single function. Deeper templates are compiled into separate steps.
+    MAX_LEVEL = 20
+
+    _ids = itertools.count()
+
+    def __init__(self, compiler: 'Compiler', mode: str = 'dump') -> None:
+        self._compiler = compiler
+        self._mode = mode
+        self._lines = list()
+        self._level = 0
+        self._counter = itertools.count()
+        self._constants = dict()
+        self.namespace = {
+            'DefaultValue': DefaultValue,
+        }
+
+    @property
+    def dumps(self,) -> bool:
+        """ `True` if the generated code should dump the data. If `False`, the
+        code that stores the dumped data shouldn't be generated at all. """
+        return self._mode == 'dump'
+
+    @property
+    def registers(self,) -> bool:
+        """ `True` if the generated code registers the errors into an error
+        manager. If `False`, the generated code returns `False` at the first
+        error instead. """
+        return self._mode != 'test'
+
+    @property
+    def source(self,) -> str:
+        """ The source code that was generated so far. """
+        return '\n'.join(self._lines) + '\n'
+
+    def emit(self, line: str) -> None:
+        """ Adds a line of code in the current indentation level. """
+        self._lines.append('    ' * self._level + line)
+
+    @contextmanager
+    def block(self,):
+        """ Increases the indentation level for the lines emitted inside the
+        context. """
+
+        start = len(self._lines)
+        self._level += 1
+
+        try:
+            yield
+
+            if len(self._lines) == start:
+                # Blocks can't be empty
+                self.emit('pass')
+
+        finally:
+            self._level -= 1
+
+    def variable(self, hint: str) -> str:
+        """ Returns a new unique name for a local variable. """
+        return f'{hint}{next(self._counter)}'
+
+    def constant(self, value: typing.Any, hint: str) -> str:
+        """ Stores the given value in the namespace of the generated function,
+        and returns the name that refers to it. """
+
+        key = id(value)
+        if key not in self._constants:
+            name = self.variable(f'_{hint}')
+            self.namespace[name] = value
+            self._constants[key] = name
+
+        return self._constants[key]
+
+    def output(self, out: str, expression: str) -> None:
+        """ Emits a line that stores the dumped data in the `out` variable.
+        Nothing is emitted if the generated code doesn't dump the data. """
+
+        if self.dumps:
+            self.emit(f'{out} = {expression}')
+
+    def register_error(self,
+                       error: type,
+                       data: str,
+                       link: str,
+                       **kwargs: str,
+                       ) -> None:
+        """ Emits a line that registers an error into the error manager (see
+        `TemplateCheckErrorManager.register`). Keyword arguments (`expected`
+        and `got`) are passed to the manager as source code expressions.
+        In the `'test'` mode, the function returns `False` instead. """
+
+        if not self.registers:
+            self.emit('return False')
+            return
+
+        arguments = ''.join(f', {key}={value}' for key, value in kwargs.items())
+        self.emit(
+            f'errors.register({self.constant(error, error.__name__)}, '
+            f'{data}, {link}{arguments})'
+        )
+
+    def node(self,
+             template: 'BaseTemplate',
+             data: str,
+             link: str,
+             out: str,
+             ) -> None:
+        """ Emits code that dumps and validates the data stored in the `data`
+        variable, and stores the dumped data in the `out` variable. `link` is
+        an expression that evaluates to the linked path of the data. """
+
+        # Imported here to avoid a circular import
+        from validit.compiler import defines_compile_method
+
+        if (self._level < self.MAX_LEVEL
+                and defines_compile_method(template, '_generate_code')
+                and not self._compiler.caches(template)):
+            template._generate_code(self, data, link, out)
+
+        elif self.registers:
+            step = self.constant(self._compiler.dump_step(template), 'step')
+            self.emit(f'{out} = {step}({data}, {link}, errors)')
+
+        else:
+            step = self.constant(self._compiler.test_step(template), 'step')
+            self.emit(f'if not {step}({data}):')
+            with self.block():
+                self.emit('return False')
+
+    def function(self, template: 'BaseTemplate') -> 'Step':
+        """ Generates the code for the given template, compiles it and returns
+        the resulting function. """
+
+        name = self._mode
+        if self.registers:
+            self._lines = [f'def {name}(data, link, errors):']
+        else:
+            self._lines = [f'def {name}(data):']
+
+        with self.block():
+            self.node(template, 'data', 'link', 'result')
+            if self.dumps:
+                self.emit('return result')
+            elif not self.registers:
+                self.emit('return True')
+
+        # Register the source code so it shows up in tracebacks
+        source = self.source
+        filename = f'<validit-generated-{next(self._ids)}>'
+        linecache.cache[filename] = (
+            len(source), None, source.splitlines(True), filename,
+        )
+
+        exec(compile(source, filename, 'exec'), self.namespace)
+        function = self.namespace[name]
+
+        # The source is needed only as long as the function exists
+        weakref.finalize(function, linecache.cache.pop, filename, None)
+        return function
@@ -0,0 +1,248 @@
+import typing
+
+from validit.containers import PathContainer
+from validit.codegen import SourceGenerator
+from validit.errors.errors import TemplateCheckError, readable_list
+from validit.errors.managers import (
+    TemplateCheckErrorManager as ErrorManager,
+    TemplateCheckRaiseOnError as RaiseOnErrorManager,
+)
+from validit.exceptions import InvalidTemplateConfiguration
+
+if typing.TYPE_CHECKING:
+    from validit.cache import ValidationCache
+    from validit.profiling import ValidationStats
+    from validit.templates.base import BaseTemplate
+
+
+# A compiled step recives the data, a linked path (see
+# `validit.containers.unlink_path`) and an error manager. It registers all of
+# the validation errors into the manager, and returns the dumped data.
+Step = typing.Callable[[typing.Any, typing.Any, ErrorManager], typing.Any]
+
+# A test step recives only the data, and returns `True` only if the data
+# follows the template.
+TestStep = typing.Callable[[typing.Any], bool]
+
+
+def defines_compile_method(template: 'BaseTemplate', method: str) -> bool:
+    """ Returns `True` only if the given compile method can be used to compile
+    the given template. If a subclass overrides the `container_dump` or the
+    `validate` methods without defining the compile method itself, the
+    inherited compile method doesn't represent the template anymore. """
+
+    for cls in type(template).__mro__:
+        attrs = vars(cls)
+
+        if method in attrs:
+            return True
+
+        if 'container_dump' in attrs or 'validate' in attrs:
+            return False
+
+    return False
+
+
+class Compiler:
+    """ Converts a template tree into a flat collection of steps. Each step is
+    a plain function that already holds references to the steps of its
+    children, so running the compiled template doesn't dispatch through the
+    template objects at all.
+
+    Steps are stored by the identity of the template, so a sub-template that
+    appears in many places of the tree (for example, after it was interned
+    using `validit.intern_template`) is compiled only once. If a stats object
+    is given, each step records its calls and timing into it. """
+
+    def __init__(self,
+                 cache: 'ValidationCache' = None,
+                 stats: 'ValidationStats' = None,
+                 ) -> None:
+        # Map the id of each template to the template and its step. The
+        # template is stored as well, so its id is not reused.
+        self._steps = dict()
+        self._tests = dict()
+        self._cache = cache
+        self._stats = stats
+
+    def caches(self, template: 'BaseTemplate') -> bool:
+        """ Returns `True` if the results of the given template are looked up
+        in a validation cache. Only the results of lists and dictionaries
+        are cached. """
+        return (self._cache is not None
+                and getattr(template, '_cacheable', False))
+
+    def dump_step(self, template: 'BaseTemplate') -> Step:
+        """ Returns a step that dumps and validates data according to the
+        given template in a single pass. """
+
+        steps = self._steps
+        if id(template) not in steps:
+            # The sub-templates are compiled first, from the deepest one up,
+            # so compiling a deeply nested template doesn't recurse once for
+            # each level of the tree
+            # Imported here to avoid a circular import
+            from validit.templates.base import bottom_up
+
+            for current in bottom_up(
+                    template, skip=lambda current: id(current) in steps):
+                if id(current) not in steps:
+                    steps[id(current)] = (current, self._compile_step(current))
+
+        return steps[id(template)][1]
+
+    def _compile_step(self, template: 'BaseTemplate') -> Step:
+        if defines_compile_method(template, '_compile_dump'):
+            step = template._compile_dump(self)
+        else:
+            step = self.fallback_dump_step(template)
+
+        if self.caches(template):
+            step = self._cache.wrap(template, step)
+
+        if self._stats is not None:
+            step = self._stats.wrap(step)
+
+        return step
+
+    def test_step(self, template: 'BaseTemplate') -> TestStep:
+        """ Returns a step that only checks if the data follows the given
+        template. The step stops at the first error it finds. """
+
+        key = id(template)
+        if key not in self._tests:
+            dump = self.dump_step(template)
+            errors = RaiseOnErrorManager()
+
+            def step(data):
+                try:
+                    dump(data, None, errors)
+                except TemplateCheckError:
+                    return False
+                return True
+
+            self._tests[key] = (template, step)
+
+        return self._tests[key][1]
+
+    @staticmethod
+    def fallback_dump_step(template: 'BaseTemplate') -> Step:
+        """ Wraps a template that doesn't know how to compile itself (for
+        example, user defined templates) with a step that uses the regular
+        `container_dump` and `validate` methods. """
+
+        def step(data, link, errors):
+            container = PathContainer(link=link)
+            template.container_dump(container, data)
+            template.validate(container, errors)
+            return container.data
+
+        return step
+
+
+class CompiledTemplate:
+    """ A template that has been compiled into a flat plan. Dumping the data
+    and validating it is done in one pass over the data.
+
+    Two backends are available: `'codegen'` (the default) generates the source
+    code of a specialized Python function for the template, and `'closures'`
+    chains together small pre-built functions. If a validation cache is
+    given, the results of valid lists and dictionaries are stored in it, and
+    reused when the same objects are validated again. If a stats object is
+    given, each template node records its timing into it (see
+    `validit.profiling.ValidationStats`); this requires the `'closures'`
+    backend. """
+
+    BACKENDS = ('codegen', 'closures')
+
+    def __init__(self,
+                 template: 'BaseTemplate',
+                 backend: str = 'codegen',
+                 cache: 'ValidationCache' = None,
+                 stats: 'ValidationStats' = None,
+                 ) -> None:
+
+        if backend not in self.BACKENDS:
+            raise InvalidTemplateConfiguration(
+                f"Unknown compilation backend {backend!r}, " +
+                f"expected {readable_list(self.BACKENDS)}"
+            )
+
+        if stats is not None and backend != 'closures':
+            raise InvalidTemplateConfiguration(
+                "Instrumented templates must use the 'closures' backend"
+            )
+
+        self._template = template
+        self._backend = backend
+        self._source = None
+        self._check = None
+        self._test = None
+
+        self._compiler = Compiler(cache, stats)
+        if backend == 'codegen':
+            generator = SourceGenerator(self._compiler)
+            self._dump = generator.function(template)
+            self._source = generator.source
+
+        else:
+            self._dump = self._compiler.dump_step(template)
+
+    @property
+    def template(self,) -> 'BaseTemplate':
+        """ Returns the template that has been compiled. """
+        return self._template
+
+    @property
+    def backend(self,) -> str:
+        """ The name of the backend used to compile the template. """
+        return self._backend
+
+    @property
+    def source(self,) -> typing.Optional[str]:
+        """ The generated source code, if the template was compiled using the
+        `'codegen'` backend. Useful for debugging. """
+        return self._source
+
+    def dump(self,
+             data: typing.Any,
+             errors: ErrorManager,
+             link: typing.Any = None,
+             ) -> typing.Any:
+        """ Validates the given data and registers the validation errors into
+        the given error manager. Returns only the relevent data (according to
+        the template), just like the `container_dump` method of the
+        template. If the data is a part of a larger document, `link` is its
+        linked path (see `validit.containers.unlink_path`). """
+        return self._dump(data, link, errors)
+
+    def check(self,
+              data: typing.Any,
+              errors: ErrorManager,
+              link: typing.Any = None,
+              ) -> None:
+        """ Validates the given data and registers the validation errors into
+        the given error manager, without dumping the data. Using the
+        `'codegen'` backend, no part of the dumped data is created at all. """
+
+        if self._check is None:
+            if self._backend == 'codegen':
+                generator = SourceGenerator(self._compiler, mode='check')
+                self._check = generator.function(self._template)
+            else:
+                self._check = self._dump
+
+        self._check(data, link, errors)
+
+    def test(self, data: typing.Any) -> bool:
+        """ Returns `True` only if the given data follows the template. Stops
+        at the first mismatch, without creating any error objects. """
+
+        if self._test is None:
+            if self._backend == 'codegen':
+                generator = SourceGenerator(self._compiler, mode='test')
+                self._test = generator.function(self._template)
+            else:
+                self._test = self._compiler.test_step(self._template)
+
+        return self._test(data)
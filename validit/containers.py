@@ -5,6 +5,8 @@ from validit.utils import DefaultValue
 
 class BaseContainer(ABC):
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def data(self,):
@@ -39,6 +41,8 @@ class ContainerIterator:
     """ An iterator that loops over a container and yields its
     container-children. """
 
+    __slots__ = ('__container', '__items')
+
     def __init__(self, container: BaseContainer):
         self.__container = container
 
@@ -59,21 +63,41 @@ class ContainerIterator:
         return self.__container[item]
 
 
+def _record_write(writes: typing.List[int],
+                  replaced: typing.Any,
+                  value: typing.Any,
+                  ) -> None:
+    """ Records a write into a tree of containers. Only writes that replace
+    existing data can make the data that other containers resolved stale, so
+    writes into missing data are not counted. """
+
+    if replaced is not DefaultValue and replaced is not value:
+        writes[0] += 1
+
+
 class HeadContainer(BaseContainer):
     """ The head container. This is the root of the tree, and only this instance
     actually stores the data. All other instances just store pointers (in some
     way or another) to a part of the data in this container. """
 
+    __slots__ = ('__data', '_writes')
+
     def __init__(self, data: typing.Any = DefaultValue):
         self.__data = data
 
+        # Counts the writes that replaced existing data in the tree of
+        # containers (see `Container`)
+        self._writes = [0]
+
     @property
     def data(self,):
         return self.__data
 
     @data.setter
     def data(self, value):
+        replaced = self.__data
         self.__data = value
+        _record_write(self._writes, replaced, value)
 
     @property
     def path(self,):
@@ -81,11 +105,45 @@ class HeadContainer(BaseContainer):
 
 
 class Container(BaseContainer):
-    """ A regular container that stores data. """
+    """ A regular container that stores data.
+
+    The container remembers the data of its parent after it is first
+    resolved, so reading and writing the data of the container doesn't walk
+    back to the head container, and the path is generated only once, when it
+    is first needed. When data that was already stored in the tree is
+    replaced through one of the containers of the tree, the remembered data
+    of all of the containers is resolved again. Data that is changed directly
+    (and not using the containers) should be replaced only through a new
+    tree of containers. """
+
+    __slots__ = ('__parent', '__chiled', '__source', '__resolved', '__path',
+                 '_writes')
 
     def __init__(self, parent: BaseContainer, chiled: typing.Union[str, int]):
         self.__parent = parent
         self.__chiled = chiled
+        self.__source = DefaultValue
+        self.__resolved = None
+        self.__path = None
+
+        # Containers of other types don't count their writes, so the data of
+        # their children is always resolved again
+        self._writes = getattr(parent, '_writes', None)
+
+    def _source(self,) -> typing.Any:
+        """ Returns the data of the parent container. """
+
+        writes = self._writes
+        if writes is not None and self.__resolved == writes[0]:
+            return self.__source
+
+        source = self.__parent.data
+        if writes is not None and source is not DefaultValue:
+            # Missing data is not remembered, since it can be written
+            # without making other containers stale
+            self.__source, self.__resolved = source, writes[0]
+
+        return source
 
     @property
     def data(self,):
@@ -93,15 +151,83 @@ class Container(BaseContainer):
         data in the container, returns the `DefaultValue` object. """
 
         try:
-            return self.__parent.data[self.__chiled]
+            return self._source()[self.__chiled]
         except LookupError:
             # If data doesn't exist
             return DefaultValue
 
     @data.setter
     def data(self, value) -> None:
-        self.__parent.data[self.__chiled] = value
+        source = self._source()
+        try:
+            replaced = source[self.__chiled]
+        except LookupError:
+            replaced = DefaultValue
+
+        source[self.__chiled] = value
+        if self._writes is not None:
+            _record_write(self._writes, replaced, value)
+
+    @property
+    def path(self,):
+        if self.__path is None:
+            self.__path = self.__parent.path + (self.__chiled,)
+        return self.__path
+
+
+def unlink_path(link) -> typing.Tuple[typing.Union[str, int]]:
+    """ Converts a linked path into a regular path tuple. A linked path is
+    either `None` (the head of the data), or a `(parent, index)` pair in which
+    `parent` is another linked path. Linked paths are cheap to extend while
+    walking the data, and are only converted into tuples when needed. """
+
+    path = list()
+    while link is not None:
+        link, index = link
+        path.append(index)
+
+    path.reverse()
+    return tuple(path)
+
+
+def path_pattern(path: typing.Tuple[typing.Union[str, int]]) -> str:
+    """ Converts a path into a path pattern, in which list indices are
+    replaced with `*`. For example, the pattern of the path
+    `('spec', 'containers', 3)` is `[spec][containers][*]`. The head of the
+    data is represented by an empty string. """
+
+    return ''.join(
+        '[*]' if isinstance(index, int) else f'[{index}]'
+        for index in path
+    )
+
+
+class PathContainer(BaseContainer):
+    """ A container that stores its data directly (just like the head
+    container), but represents a part of a larger data structure. Used by
+    compiled templates, which walk the data without building a chain of
+    containers, to report where an error occurred. """
+
+    __slots__ = ('__data', '__link', '__path', '_writes')
+
+    def __init__(self, data: typing.Any = DefaultValue, link=None):
+        self.__data = data
+        self.__link = link
+        self.__path = None
+        self._writes = [0]
+
+    @property
+    def data(self,):
+        return self.__data
+
+    @data.setter
+    def data(self, value):
+        replaced = self.__data
+        self.__data = value
+        _record_write(self._writes, replaced, value)
 
     @property
     def path(self,):
-        return self.__parent.path + (self.__chiled,)
+        if self.__path is None:
+            self.__path = unlink_path(self.__link)
+        return self.__path
@@ -1,8 +1,9 @@
 import typing
+import copyreg
 import re
 
 from termcolor import colored
-from validit.containers import BaseContainer
+from validit.containers import BaseContainer, PathContainer, unlink_path
 
 
 def readable_list(items: typing.List[str]) -> str:
@@ -23,16 +24,52 @@ def readable_list(items: typing.List[str]) -> str:
 class TemplateCheckError(Exception):
     """ A general object that represents a template check error.
     Although you can create instances of it, it is highly recommended to use
-    subclasses of it to better describe the check error. """
+    subclasses of it to better describe the check error.
+
+    Errors only store the raw information about the mismatch when they are
+    created. The messages are generated only when they are first needed. """
 
     def __init__(self,
                  container: BaseContainer = None,
                  msg: str = None,
                  ) -> None:
         self.container = container
-        self.msg = msg
+        self._msg = msg
+        self._str = None
+        super().__init__()
+
+    @classmethod
+    def _from_record(cls, record: 'TemplateCheckErrorRecord'
+                     ) -> 'TemplateCheckError':
+        """ Creates an error from the information stored in an error
+        record. """
+        return cls(
+            container=PathContainer(record.data, record.link),
+            expected=record.expected,
+            got=record.got,
+        )
 
-        super().__init__(self.description)
+    def __reduce__(self,):
+        """ Errors don't pass their arguments to the `Exception` constructor,
+        so they are pickled by restoring their attributes directly. """
+        return copyreg.__newobj__, (type(self),), self.__dict__
+
+    def _message(self,) -> typing.Optional[str]:
+        """ Generates the message of the error. Subclasses override this
+        method to generate their message from the information they store. """
+        return None
+
+    @property
+    def msg(self,) -> typing.Optional[str]:
+        """ A short message that describes the error. """
+        if self._msg is None:
+            self._msg = self._message()
+        return self._msg
+
+    @msg.setter
+    def msg(self, value: typing.Optional[str]) -> None:
+        self._msg = value
+        self._str = None
 
     @property
     def path(self,) -> typing.Tuple[str]:
@@ -60,8 +97,12 @@ class TemplateCheckError(Exception):
         """ Generates and returns a colors string that represents the current
         template check error. """
 
-        spacing = ' ' if self.description and self.path_str else ''
-        return f'{self.path_str}{spacing}{self.description}'
+        if self._str is None:
+            path_str, description = self.path_str, self.description
+            spacing = ' ' if description and path_str else ''
+            self._str = f'{path_str}{spacing}{description}'
+
+        return self._str
 
     @property
     def no_color_str(self,) -> str:
@@ -75,7 +116,15 @@ class TemplateCheckMissingDataError(TemplateCheckError):
     data is missing. """
 
     def __init__(self, container: BaseContainer) -> None:
-        super().__init__(container, msg='Missing required information')
+        super().__init__(container)
+
+    @classmethod
+    def _from_record(cls, record: 'TemplateCheckErrorRecord'
+                     ) -> 'TemplateCheckMissingDataError':
+        return cls(PathContainer(record.data, record.link))
+
+    def _message(self,) -> str:
+        return 'Missing required information'
 
 
 class TemplateCheckInvalidOptionError(TemplateCheckError):
@@ -87,11 +136,10 @@ class TemplateCheckInvalidOptionError(TemplateCheckError):
                  ) -> None:
         self.expected = expected
         self.got = got
+        super().__init__(container)
 
-        super().__init__(
-            container,
-            msg=f"Expected {readable_list(expected)} but got {repr(got)}"
-        )
+    def _message(self,) -> str:
+        return f"Expected {readable_list(self.expected)} but got {self.got!r}"
 
 
 class TemplateCheckInvalidDataError(TemplateCheckError):
@@ -105,15 +153,13 @@ class TemplateCheckInvalidDataError(TemplateCheckError):
                  ) -> None:
         self.expected = expected
         self.got = got
+        super().__init__(container)
 
-        expected_str = readable_list([cls.__name__ for cls in expected])
-        got_type = type(got) if not isinstance(got, type) else got
+    def _message(self,) -> str:
+        expected_str = readable_list([cls.__name__ for cls in self.expected])
+        got_type = self.got if isinstance(self.got, type) else type(self.got)
         got_str = repr(got_type.__name__)
-
-        super().__init__(
-            container,
-            msg=f"Expected {expected_str} but got {got_str}",
-        )
+        return f"Expected {expected_str} but got {got_str}"
 
 
 class TemplateCheckListLengthError(TemplateCheckError):
@@ -121,7 +167,46 @@ class TemplateCheckListLengthError(TemplateCheckError):
     has an invalid length according to the template configuration. """
 
     def __init__(self, container: BaseContainer, expected: typing.Any, got: int):
-        super().__init__(
-            container,
-            f'List length {got} is not {expected!r}',
-        )
+        self.expected = expected
+        self.got = got
+        super().__init__(container)
+
+    def _message(self,) -> str:
+        return f'List length {self.got} is not {self.expected!r}'
+
+
+class TemplateCheckErrorRecord:
+    """ A compact representation of a template check error, that stores only
+    the type of the error, the data, its linked path (see
+    `validit.containers.unlink_path`), and the expected and the received
+    values. Error collections store records instead of error objects, and
+    convert them into errors only when the errors are accessed, so
+    documents with many errors take much less memory. """
+
+    __slots__ = ('error_type', 'data', 'link', 'expected', 'got')
+
+    def __init__(self,
+                 error_type: typing.Type[TemplateCheckError],
+                 data: typing.Any,
+                 link: typing.Any,
+                 expected: typing.Any = None,
+                 got: typing.Any = None,
+                 ) -> None:
+        self.error_type = error_type
+        self.data = data
+        self.link = link
+        self.expected = expected
+        self.got = got
+
+    def __reduce__(self,):
+        return (type(self), (self.error_type, self.data, self.link,
+                             self.expected, self.got))
+
+    @property
+    def path(self,) -> typing.Tuple[typing.Union[str, int]]:
+        """ The path from the main data to the data of the error. """
+        return unlink_path(self.link)
+
+    def error(self,) -> TemplateCheckError:
+        """ Creates the error object that this record represents. """
+        return self.error_type._from_record(self)
@@ -2,7 +2,20 @@ import typing
 from abc import ABC, abstractmethod
 from termcolor import colored
 
-from .errors import TemplateCheckError
+from validit.containers import path_pattern
+from .errors import TemplateCheckError, TemplateCheckErrorRecord
+
+
+def _pattern_key(link: typing.Any) -> tuple:
+    """ Returns the path pattern of the given linked path, as a tuple of its
+    indices in reverse order, in which list indices are replaced with `*`.
+    Computing this key is much cheaper than formatting the pattern. """
+
+    key = list()
+    while link is not None:
+        link, index = link
+        key.append('*' if index.__class__ is int else index)
+    return tuple(key)
 
 
 class TemplateCheckErrorManager(ABC):
@@ -11,15 +24,71 @@ class TemplateCheckErrorManager(ABC):
     def register_error(self, error: TemplateCheckError) -> None:
         pass
 
+    def register(self,
+                 error_type: typing.Type[TemplateCheckError],
+                 data: typing.Any,
+                 link: typing.Any,
+                 expected: typing.Any = None,
+                 got: typing.Any = None,
+                 ) -> None:
+        """ Registers an error of the given type, that occurred in the given
+        data (in the given linked path). Compiled templates report their
+        errors using this method, so managers can store the information
+        about the error without creating the error object. By default, the
+        error object is created and passed to `register_error`. """
+
+        record = TemplateCheckErrorRecord(error_type, data, link, expected, got)
+        self.register_error(record.error())
+
 
 class TemplateCheckErrorCollection(TemplateCheckErrorManager):
-    """ An object that collects errors and can display them to the user. """
+    """ An object that collects errors and can display them to the user.
+
+    Errors that are reported using `register` are stored as compact error
+    records, and the error objects are created only when the errors are
+    first accessed. `errors` is always the same list, so errors that are
+    appended to it directly are counted as well.
+
+    If `max_errors` is given, only the first `max_errors` errors are stored,
+    and the rest of the errors are only counted. If `aggregate` is set, they
+    are counted separately for each path pattern (see
+    `validit.containers.path_pattern`), so the summary shows where the
+    omitted errors occurred. """
+
+    def __init__(self,
+                 max_errors: typing.Optional[int] = None,
+                 aggregate: bool = True,
+                 ) -> None:
+        self.max_errors = max_errors
+        self.aggregate = aggregate
+
+        self._errors: typing.List[
+            typing.Union[TemplateCheckError, TemplateCheckErrorRecord]
+        ] = list()
+        self._records = 0
+        self._dropped = 0
+        self._omitted: typing.Dict[tuple, int] = dict()
 
-    def __init__(self):
-        self.errors = list()
+    @property
+    def errors(self,) -> typing.List[TemplateCheckError]:
+        """ The list of the stored errors. The error records that were
+        registered since the last access are replaced in place with their
+        error objects, so each error object is created only once. """
+
+        errors = self._errors
+        index = len(errors)
+        while self._records and index:
+            # Records are appended, so the new ones are at the end
+            index -= 1
+            if isinstance(errors[index], TemplateCheckErrorRecord):
+                errors[index] = errors[index].error()
+                self._records -= 1
+
+        self._records = 0
+        return errors  # type: ignore
 
     def __iter__(self,) -> typing.Iterator[TemplateCheckError]:
-        return (error for error in self.errors)
+        return iter(self.errors)
 
     def __len__(self,) -> int:
         """ Returns the number of registered errors """
@@ -31,23 +100,104 @@ class TemplateCheckErrorCollection(TemplateCheckErrorManager):
 
     def __str__(self) -> str:
         """ Returns a colored string that shows the results of the check """
-        return '\n'.join(error.__str__() for error in self)
+
+        lines = [error.__str__() for error in self]
+        remaining = self.omitted
+
+        for pattern, count in self.omitted_paths.items():
+            path = colored(pattern, 'yellow') + ' ' if pattern else ''
+            lines.append(path + colored(f'{count:,} more errors', 'red'))
+            remaining -= count
+
+        if remaining:
+            # Omitted errors that were not aggregated by their path
+            lines.append(colored(f'{remaining:,} more errors', 'red'))
+
+        return '\n'.join(lines)
 
     @property
     def count(self,) -> int:
-        """ Returns the number of registered errors """
-        return len([error for error in self])
+        """ Returns the number of registered errors, including errors that
+        were omitted from the collection. """
+        return len(self._errors) + self._dropped
+
+    @property
+    def omitted(self,) -> int:
+        """ The number of registered errors that were not stored, because
+        the collection already stored `max_errors` errors. """
+        return self._dropped
+
+    @property
+    def omitted_paths(self,) -> typing.Dict[str, int]:
+        """ Maps each path pattern to the number of omitted errors that
+        occurred in it. Empty if the omitted errors are not aggregated. """
+        return {
+            path_pattern(key[::-1]): count
+            for key, count in self._omitted.items()
+        }
+
+    def _full(self,) -> bool:
+        return (self.max_errors is not None
+                and len(self._errors) >= self.max_errors)
+
+    def _omit(self, key: tuple) -> None:
+        self._omitted[key] = self._omitted.get(key, 0) + 1
 
     def register_error(self, error: TemplateCheckError) -> None:
         """ Add an error to the collection. """
-        self.errors.append(error)
+
+        if self._full():
+            self._dropped += 1
+            if self.aggregate:
+                self._omit(tuple(
+                    '*' if isinstance(index, int) else index
+                    for index in reversed(error.path)
+                ))
+            return
+
+        self._errors.append(error)
+
+    def register(self,
+                 error_type: typing.Type[TemplateCheckError],
+                 data: typing.Any,
+                 link: typing.Any,
+                 expected: typing.Any = None,
+                 got: typing.Any = None,
+                 ) -> None:
+        """ Add an error to the collection, as an error record. """
+
+        if self._full():
+            self._dropped += 1
+            if self.aggregate:
+                self._omit(_pattern_key(link))
+            return
+
+        self._errors.append(
+            TemplateCheckErrorRecord(error_type, data, link, expected, got))
+        self._records += 1
 
     def dump_errors(self, destination: TemplateCheckErrorManager):
         """ Dumps each error in the current error collection into the given
-        error manager. """
-
-        for error in self:
-            destination.register_error(error)
+        error manager. If the destination is an error collection, the counts
+        of the omitted errors are added to it as well. """
+
+        for error in self._errors:
+            if isinstance(error, TemplateCheckErrorRecord):
+                destination.register(
+                    error.error_type, error.data, error.link,
+                    error.expected, error.got,
+                )
+            else:
+                destination.register_error(error)
+
+        if isinstance(destination, TemplateCheckErrorCollection):
+            destination._dropped += self.omitted
+            if not destination.aggregate:
+                return
+
+            for key, count in self._omitted.items():
+                destination._omitted[key] = \
+                    destination._omitted.get(key, 0) + count
 
 
 class TemplateCheckRaiseOnError(TemplateCheckErrorManager):
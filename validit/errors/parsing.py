@@ -1,3 +1,4 @@
+import re
 import typing
 from .errors import TemplateCheckError
 
@@ -9,21 +10,30 @@ class FileParsingError(TemplateCheckError):
     def __init__(self,
                  filetype: str = None,
                  msg: str = None,
-                 pos: typing.Tuple[int, int] = None,
+                 pos: typing.Tuple[int, typing.Optional[int]] = None,
                  ):
-
-        if filetype:
-            string = f'Failed to parse {filetype} file'
+        self.filetype = filetype
+        self.details = msg
+        self.pos = pos
+        super().__init__()
+
+    def _message(self,) -> str:
+        if self.filetype:
+            string = f'Failed to parse {self.filetype} file'
         else:
             string = 'Failed to parse file'
 
-        if msg:
-            string += f': {msg}'
+        if self.details:
+            string += f': {self.details}'
 
-        if pos:
-            string += f' (line {pos[0]} column {pos[1]})'
+        if self.pos:
+            line, column = self.pos
+            if column is None:
+                string += f' (line {line})'
+            else:
+                string += f' (line {line} column {column})'
 
-        super().__init__(msg=string)
+        return string
 
 
 class JsonParsingError(FileParsingError):
@@ -32,12 +42,16 @@ class JsonParsingError(FileParsingError):
 
     def __init__(self, exception):
         """ Recives a `json.JSONDecodeError` error and passes it to the file
-        parsing error constructor. """
+        parsing error constructor. Errors of other JSON parsers that don't
+        store the position of the error are also accepted. """
+
+        lineno = getattr(exception, 'lineno', None)
+        colno = getattr(exception, 'colno', None)
 
         super().__init__(
             filetype='JSON',
-            msg=exception.msg,
-            pos=(exception.lineno, exception.colno),
+            msg=getattr(exception, 'msg', None) or str(exception),
+            pos=(lineno, colno) if lineno is not None else None,
         )
 
 
@@ -47,15 +61,16 @@ class YamlParsingError(FileParsingError):
 
     def __init__(self, exception):
         """ Recives a `yaml.YAMLError` error and passes it to the file
-        parsing error constructor. """
+        parsing error constructor. Errors that don't store the problem and
+        its position (for example, errors of files that are not encoded
+        correctly) are also accepted. """
+
+        mark = getattr(exception, 'problem_mark', None)
 
         super().__init__(
             filetype='YAML',
-            msg=exception.problem,
-            pos=(
-                exception.problem_mark.line,
-                exception.problem_mark.column
-            ),
+            msg=getattr(exception, 'problem', None) or str(exception),
+            pos=(mark.line, mark.column) if mark is not None else None,
         )
 
 
@@ -63,12 +78,23 @@ class TomlParsingError(FileParsingError):
     """ Raised or registered into a error manager when a YAML file is not
     formatted correctly and is invalid. """
 
+    # Errors of `tomllib` and `tomli` include the position in the message
+    POSITION = re.compile(r'^(.*) \(at line (\d+), column (\d+)\)$')
+
     def __init__(self, exception):
-        """ Recives a `toml.TomlDecodeError` error and passes it to the file
-        parsing error constructor. """
+        """ Recives a `toml.TomlDecodeError` (or a `tomllib.TOMLDecodeError`)
+        error and passes it to the file parsing error constructor. """
 
-        super().__init__(
-            filetype='TOML',
-            msg=exception.msg,
-            pos=(exception.lineno, exception.colno),
-        )
+        msg = getattr(exception, 'msg', None) or str(exception)
+        pos = None
+
+        if hasattr(exception, 'lineno'):
+            pos = (exception.lineno, exception.colno)
+
+        else:
+            match = self.POSITION.match(msg)
+            if match is not None:
+                msg = match.group(1)
+                pos = (int(match.group(2)), int(match.group(3)))
+
+        super().__init__(filetype='TOML', msg=msg, pos=pos)
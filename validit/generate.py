@@ -0,0 +1,229 @@
+import typing
+import random
+import itertools
+
+from validit.compiler import defines_compile_method
+from validit.exceptions import ValidItError
+from validit.templates.base import BaseTemplate
+from validit.utils import AnyLength, DefaultValue
+
+
+class DataGenerator:
+    """ Generates random data that follows a template. Templates generate
+    their own data using the `_generate` method. The generated data is
+    reproducible: generators with the same `seed` generate the same data.
+
+    `size` is the typical number of elements in generated lists, and of
+    characters in generated strings. `optional_rate` is the probability that
+    a key of an `Optional` template is left out of a dictionary.
+
+    `error_rate` is the probability that a document generated using the
+    `document` and `documents` methods is deliberately invalid. An invalid
+    document contains a single mismatch (a value of the wrong type, a list
+    of an invalid length, a missing key or an unknown option) at a random
+    place in an otherwise valid document. """
+
+    def __init__(self,
+                 seed: typing.Any = None,
+                 size: int = 8,
+                 optional_rate: float = 0.5,
+                 error_rate: float = 0,
+                 ) -> None:
+        self.random = random.Random(seed)
+        self.size = size
+        self.optional_rate = optional_rate
+        self.error_rate = error_rate
+
+        self._samplers = {
+            bool: lambda: self.random.random() < 0.5,
+            int: lambda: self.random.getrandbits(32) - 2 ** 31,
+            float: lambda: (self.random.random() - 0.5) * 2e6,
+            str: self.string,
+            bytes: lambda: self.string().encode('ascii'),
+            list: lambda: [self.scalar() for _ in range(self.length())],
+            tuple: lambda: tuple(self.scalar() for _ in range(self.length())),
+            dict: lambda: {self.string(): self.scalar()
+                           for _ in range(self.length())},
+            type(None): lambda: None,
+        }
+        self._scalars = (int, float, str, bool, type(None))
+
+        # Template types that can (or can't) generate data
+        self._supported = dict()
+
+    def _check(self, template: BaseTemplate, method: str) -> None:
+        key = (type(template), method)
+        supported = self._supported.get(key)
+
+        if supported is None:
+            supported = defines_compile_method(template, method)
+            self._supported[key] = supported
+
+        if not supported:
+            raise ValidItError(
+                f"Can't generate data for '{type(template).__name__}' "
+                "templates"
+            )
+
+    def generate(self, template: BaseTemplate) -> typing.Any:
+        """ Returns random data that follows the given template. """
+        self._check(template, '_generate')
+        return template._generate(self)
+
+    def invalid(self, template: BaseTemplate) -> typing.Any:
+        """ Returns random data that doesn't follow the given template. If the
+        template accepts any data (for example, `TemplateAny`), returns
+        `DefaultValue`, since only missing data doesn't follow the template.
+        Raises a `ValidItError` if the template accepts any data, including
+        missing data. """
+        self._check(template, '_generate_invalid')
+        return template._generate_invalid(self)
+
+    def document(self, template: BaseTemplate) -> typing.Any:
+        """ Returns a random document that follows the given template, or,
+        with a probability of `error_rate`, a document that doesn't. """
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            data = self.invalid(template)
+            if data is DefaultValue:
+                raise ValidItError(
+                    f"Can't generate an invalid document for {template!r}")
+            return data
+
+        return self.generate(template)
+
+    def documents(self,
+                  template: BaseTemplate,
+                  count: typing.Optional[int] = None,
+                  ) -> typing.Iterator[typing.Any]:
+        """ Yields `count` random documents (see `document`). If `count` is
+        `None`, yields documents forever. """
+
+        counter = itertools.count() if count is None else range(count)
+        document = self.document
+        return (document(template) for _ in counter)
+
+    def choice(self, options: typing.Sequence) -> typing.Any:
+        """ Returns a random element of the given sequence. """
+        return options[int(self.random.random() * len(options))]
+
+    def string(self,) -> str:
+        """ Returns a random string of hexadecimal digits. """
+        length = self.length()
+        if not length:
+            return ''
+        return '%0*x' % (length, self.random.getrandbits(4 * length))
+
+    def scalar(self,) -> typing.Any:
+        """ Returns a random number, string, boolean or `None`. """
+        return self._samplers[self.choice(self._scalars)]()
+
+    def length(self, valid_lengths: typing.Any = AnyLength()) -> int:
+        """ Returns a random length that is contained in the given set of
+        valid lengths. """
+
+        if isinstance(valid_lengths, AnyLength):
+            return int(self.random.random() * (2 * self.size + 1))
+
+        if isinstance(valid_lengths, range):
+            if valid_lengths:
+                return self.choice(valid_lengths)
+
+        elif isinstance(valid_lengths, typing.Collection):
+            lengths = [length for length in valid_lengths
+                       if isinstance(length, int) and length >= 0]
+            if lengths:
+                return self.choice(sorted(lengths))
+
+        else:
+            # A custom set of lengths, that can only be checked
+            length = self._find_length(
+                lambda length: length in valid_lengths)
+            if length is not None:
+                return length
+
+        raise ValidItError(f"Can't choose a length from {valid_lengths!r}")
+
+    def invalid_length(self, valid_lengths: typing.Any) -> typing.Optional[int]:
+        """ Returns a random length that is not contained in the given set of
+        valid lengths, or `None` if there is no such length. """
+
+        if isinstance(valid_lengths, AnyLength):
+            return None
+
+        return self._find_length(
+            lambda length: length not in valid_lengths)
+
+    def _find_length(self, accept: typing.Callable[[int], bool]
+                     ) -> typing.Optional[int]:
+        candidates = list(range(4 * self.size + 1))
+        self.random.shuffle(candidates)
+        return next((length for length in candidates if accept(length)), None)
+
+    def instance(self, types: typing.Tuple[type, ...]) -> typing.Any:
+        """ Returns a random instance of one of the given types. Types that
+        the generator doesn't know are instantiated without arguments. """
+
+        cls = types[0] if len(types) == 1 else self.choice(types)
+
+        sampler = self._samplers.get(cls)
+        if sampler is not None:
+            return sampler()
+
+        if cls is object:
+            return self.blob()
+
+        try:
+            return cls()
+        except Exception:
+            raise ValidItError(
+                f"Can't generate an instance of '{cls.__name__}'") from None
+
+    def other_instance(self, types: typing.Tuple[type, ...]) -> typing.Any:
+        """ Returns a random instance that is not an instance of any of the
+        given types, or `DefaultValue` if there is no such instance. """
+
+        others = [cls for cls in self._samplers
+                  if not issubclass(cls, types)]
+        if not others:
+            return DefaultValue
+
+        return self._samplers[self.choice(others)]()
+
+    def blob(self, depth: int = 2) -> typing.Any:
+        """ Returns a random tree of dictionaries, lists and scalars. """
+
+        if depth <= 0:
+            return self.scalar()
+
+        if self.random.random() < 0.5:
+            return [self.blob(depth - 1) for _ in range(self.length())]
+
+        return {self.string(): self.blob(depth - 1)
+                for _ in range(self.length())}
+
+
+def generate(template: BaseTemplate,
+             seed: typing.Any = None,
+             size: int = 8,
+             ) -> typing.Any:
+    """ Returns random data that follows the given template (see
+    `DataGenerator`). If the template is an `Optional` template, the
+    returned data may be `DefaultValue` (which represents missing data). """
+    return DataGenerator(seed, size).generate(template)
+
+
+def generate_many(template: BaseTemplate,
+                  count: typing.Optional[int] = None,
+                  seed: typing.Any = None,
+                  size: int = 8,
+                  error_rate: float = 0,
+                  ) -> typing.Iterator[typing.Any]:
+    """ Yields `count` random documents (or infinitely many documents, if
+    `count` is `None`) that follow the given template. A portion of
+    `error_rate` of the documents is deliberately invalid (see
+    `DataGenerator`). The documents are generated lazily, so any number of
+    documents can be streamed without holding them in memory. """
+
+    generator = DataGenerator(seed, size, error_rate=error_rate)
+    return generator.documents(template, count)
@@ -0,0 +1,57 @@
+import weakref
+
+from validit.templates.base import BaseTemplate, bottom_up
+
+
+class TemplateInterner:
+    """ Collapses templates with the same structure (see
+    `BaseTemplate.__eq__`) into a single shared instance. Interning a
+    template returns a template in which each sub-template is replaced with
+    the shared instance of that sub-template, so identical parts of many
+    templates (for example, an address block that appears in many schemas)
+    are stored in memory only once, and are compiled and fingerprinted only
+    once. The interned templates themselves are never changed.
+
+    The interner holds weak references to the shared instances, so templates
+    that are no longer used are not kept alive by the interner. """
+
+    def __init__(self,) -> None:
+        self._templates = weakref.WeakValueDictionary()
+
+    def __len__(self,) -> int:
+        """ Returns the number of shared template instances. """
+        return len(self._templates)
+
+    def intern(self, template: BaseTemplate) -> BaseTemplate:
+        """ Returns the shared instance of the given template. If no template
+        with the same structure was interned before, a template whose
+        sub-templates are the shared instances of the sub-templates of the
+        given template becomes the shared instance (this is the given
+        template itself, if its sub-templates are already shared). """
+
+        # The sub-templates are interned first, from the deepest one up, so
+        # the parents are built from the shared instances of their children
+        shared = dict()
+        for current in bottom_up(template):
+            replaced = current._replace_children(
+                lambda child: shared[id(child)])
+
+            key = replaced._structure_key()
+            instance = self._templates.get(key)
+            if instance is None:
+                instance = self._templates[key] = replaced
+
+            shared[id(current)] = instance
+
+        return shared[id(template)]
+
+
+# The interner used by the `intern_template` function
+_interner = TemplateInterner()
+
+
+def intern_template(template: BaseTemplate) -> BaseTemplate:
+    """ Returns the shared instance of the given template, using a global
+    interner (see `TemplateInterner`). The sub-templates of the returned
+    template are shared instances as well. """
+    return _interner.intern(template)
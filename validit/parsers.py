@@ -0,0 +1,328 @@
+import mmap
+import typing
+import importlib
+from abc import ABC, abstractmethod
+
+from validit.exceptions import MissingExtras, ValidItError
+from validit.errors.errors import readable_list
+
+from validit.errors.parsing import (
+    FileParsingError,
+    JsonParsingError,
+    YamlParsingError,
+    TomlParsingError,
+)
+
+
+# Bytes-like objects that can be parsed using the `loads_buffer` method
+Buffer = typing.Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class ParserBackend(ABC):
+    """ Loads files of a single format using a specific package. Backends
+    import the required modules only when they are first used. """
+
+    # The file format (for example, 'json') and the name of the backend
+    filetype: str = None
+    name: str = None
+
+    # The modules required by the backend, and the extra that installs them
+    module_names: typing.Tuple[str] = ()
+    extra: str = None
+
+    def __init__(self,) -> None:
+        self._modules = None
+
+    def __repr__(self,) -> str:
+        return f'<{type(self).__name__} {self.name!r}>'
+
+    def __getstate__(self,) -> dict:
+        """ Imported modules can't be pickled, so they are imported again
+        when the unpickled backend is first used. """
+
+        state = self.__dict__.copy()
+        state['_modules'] = None
+        return state
+
+    @property
+    def modules(self,) -> typing.Dict[str, typing.Any]:
+        """ A dictionary of the imported modules required by the backend.
+        Raises a `MissingExtras` error if one of the modules is not
+        installed. """
+
+        if self._modules is None:
+            modules = dict()
+
+            for name in self.module_names:
+                try:
+                    modules[name] = importlib.import_module(name)
+
+                except ImportError as error:
+                    install = (f'validit[{self.extra}]' if self.extra
+                               else ' '.join(self.module_names))
+                    raise MissingExtras(
+                        f"To parse {self.filetype.upper()} files using the " +
+                        f"'{self.name}' parser you must install additional " +
+                        f"required packages. Use 'pip install {install}'"
+                    ) from error
+
+            self._modules = modules
+
+        return self._modules
+
+    def require(self,) -> None:
+        """ Raises a `MissingExtras` error if the backend can't be used. """
+        self.modules
+
+    def available(self,) -> bool:
+        """ Returns `True` if the backend can be used. """
+
+        try:
+            self.require()
+        except MissingExtras:
+            return False
+        return True
+
+    @property
+    @abstractmethod
+    def errors(self,) -> typing.Tuple[type]:
+        """ The exceptions that the backend raises if the file is not
+        formatted correctly, including files that are not encoded
+        correctly. """
+
+    @abstractmethod
+    def loads(self, text: typing.Union[str, bytes]) -> typing.Any:
+        """ Parses and returns the data stored in the given string. """
+
+    def load(self, fp: typing.IO) -> typing.Any:
+        """ Parses and returns the data stored in the given file. """
+        return self.loads(fp.read())
+
+    def loads_buffer(self, buffer: Buffer) -> typing.Any:
+        """ Parses and returns the data stored in the given bytes-like object
+        (`bytes`, `bytearray`, `memoryview` or `mmap`), which is encoded in
+        UTF-8. By default, the whole buffer is decoded into a string first.
+        Backends that can parse the raw bytes directly (like `orjson`)
+        override this to avoid the decoded copy. """
+        return self.loads(str(buffer, 'utf-8'))
+
+    def parsing_error(self, exception: Exception) -> FileParsingError:
+        """ Converts an exception raised by the backend into a file parsing
+        error, that can be registered into an error manager. """
+        return FileParsingError(self.filetype.upper(), str(exception))
+
+
+class JsonBackend(ParserBackend):
+    filetype = 'json'
+    name = 'json'
+    module_names = ('json',)
+
+    @property
+    def errors(self,):
+        return (self.modules['json'].JSONDecodeError, UnicodeDecodeError)
+
+    def loads(self, text):
+        return self.modules['json'].loads(text)
+
+    def load(self, fp):
+        return self.modules['json'].load(fp)
+
+    def parsing_error(self, exception):
+        return JsonParsingError(exception)
+
+
+class OrjsonBackend(JsonBackend):
+    name = 'orjson'
+    module_names = ('orjson',)
+
+    @property
+    def errors(self,):
+        return (self.modules['orjson'].JSONDecodeError, UnicodeDecodeError)
+
+    def loads(self, text):
+        return self.modules['orjson'].loads(text)
+
+    def loads_buffer(self, buffer):
+        # orjson parses any contiguous buffer in place
+        with memoryview(buffer) as view:
+            return self.loads(view)
+
+    def load(self, fp):
+        return self.loads(fp.read())
+
+
+class UjsonBackend(JsonBackend):
+    name = 'ujson'
+    module_names = ('ujson',)
+
+    @property
+    def errors(self,):
+        return (self.modules['ujson'].JSONDecodeError, UnicodeDecodeError)
+
+    def loads(self, text):
+        return self.modules['ujson'].loads(text)
+
+    def load(self, fp):
+        return self.loads(fp.read())
+
+
+class PyYAMLBackend(ParserBackend):
+    """ Loads YAML files using the loader used by `yaml.full_load`. """
+
+    filetype = 'yaml'
+    name = 'pyyaml'
+    module_names = ('yaml',)
+    extra = 'yaml'
+
+    @property
+    def loader(self,) -> type:
+        return self.modules['yaml'].FullLoader
+
+    @property
+    def errors(self,):
+        return (self.modules['yaml'].YAMLError, UnicodeDecodeError)
+
+    def loads(self, text):
+        return self.modules['yaml'].load(text, Loader=self.loader)
+
+    def load(self, fp):
+        return self.loads(fp)
+
+    def loads_buffer(self, buffer):
+        if isinstance(buffer, mmap.mmap):
+            # Memory mapped files are read (and decoded) in small chunks,
+            # just like regular files.
+            buffer.seek(0)
+            return self.loads(buffer)
+
+        return self.loads(bytes(buffer))
+
+    def load_all(self, fp: typing.IO) -> typing.Iterator[typing.Any]:
+        """ Lazily parses and yields each of the documents in the stream. """
+        return self.modules['yaml'].load_all(fp, Loader=self.loader)
+
+    def parsing_error(self, exception):
+        return YamlParsingError(exception)
+
+
+class LibYAMLBackend(PyYAMLBackend):
+    """ Loads YAML files using the C implementation of the loader, which is
+    available only if PyYAML was built with the libyaml bindings. """
+
+    name = 'libyaml'
+
+    def require(self,):
+        if not getattr(self.modules['yaml'], '__with_libyaml__', False):
+            raise MissingExtras(
+                "PyYAML is installed without the libyaml bindings, " +
+                "so the 'libyaml' parser can't be used"
+            )
+
+    @property
+    def loader(self,):
+        return self.modules['yaml'].CFullLoader
+
+
+class TomllibBackend(ParserBackend):
+    """ Loads TOML files using the `tomllib` module, which is included in
+    Python 3.11 and newer. """
+
+    filetype = 'toml'
+    name = 'tomllib'
+    module_names = ('tomllib',)
+
+    @property
+    def errors(self,):
+        return (self.modules[self.module_names[0]].TOMLDecodeError,
+                UnicodeDecodeError)
+
+    def loads(self, text):
+        return self.modules[self.module_names[0]].loads(text)
+
+    def parsing_error(self, exception):
+        return TomlParsingError(exception)
+
+
+class TomliBackend(TomllibBackend):
+    """ Loads TOML files using the `tomli` package, which is the backport of
+    the `tomllib` module for older Python versions. """
+
+    name = 'tomli'
+    module_names = ('tomli',)
+
+
+class TomlBackend(ParserBackend):
+    filetype = 'toml'
+    name = 'toml'
+    module_names = ('toml',)
+    extra = 'toml'
+
+    @property
+    def errors(self,):
+        return (self.modules['toml'].TomlDecodeError, UnicodeDecodeError)
+
+    def loads(self, text):
+        return self.modules['toml'].loads(text)
+
+    def load(self, fp):
+        return self.modules['toml'].load(fp)
+
+    def parsing_error(self, exception):
+        return TomlParsingError(exception)
+
+
+# The registered backends of each file format, ordered by preference. If no
+# backend is requested explicitly, the first available backend is used. The
+# faster backends don't load every file in exactly the same way (for example,
+# orjson rejects `NaN` and loads huge integers as floats), so they are used
+# only if they are requested explicitly.
+PARSERS = {
+    'json': [JsonBackend(), OrjsonBackend(), UjsonBackend()],
+    'yaml': [PyYAMLBackend(), LibYAMLBackend()],
+    'toml': [TomlBackend(), TomllibBackend(), TomliBackend()],
+}
+
+
+def register_parser(backend: ParserBackend, preferred: bool = True) -> None:
+    """ Registers a new parser backend. If `preferred` is set, the backend
+    will be used by default (if it is available) instead of the backends that
+    were registered before it. """
+
+    backends = PARSERS.setdefault(backend.filetype, list())
+    if preferred:
+        backends.insert(0, backend)
+    else:
+        backends.append(backend)
+
+
+def get_parser(filetype: str,
+               parser: typing.Union[str, ParserBackend] = None,
+               ) -> ParserBackend:
+    """ Returns the parser backend used to load files of the given format.
+    If `parser` is a name of a backend, returns the backend with the given
+    name. Otherwise, returns the first available backend. """
+
+    if isinstance(parser, ParserBackend):
+        return parser
+
+    backends = PARSERS.get(filetype)
+    if not backends:
+        raise ValidItError(f"No parsers are registered for {filetype!r} files")
+
+    if parser is not None:
+        for backend in backends:
+            if backend.name == parser:
+                backend.require()
+                return backend
+
+        raise ValidItError(
+            f"Unknown {filetype.upper()} parser {parser!r}, expected " +
+            readable_list([backend.name for backend in backends])
+        )
+
+    for backend in backends:
+        if backend.available():
+            return backend
+
+    # Raise the error of the default backend
+    backends[0].require()
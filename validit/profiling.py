@@ -0,0 +1,173 @@
+import time
+import typing
+
+from validit.compiler import CompiledTemplate, Step
+from validit.containers import path_pattern, unlink_path
+
+if typing.TYPE_CHECKING:
+    from validit.templates.base import BaseTemplate
+
+
+class NodeStats:
+    """ The number of times a template node was validated, and the time it
+    took. `time` includes the time spent in the children of the node, and
+    `self_time` doesn't. Times are measured in seconds. """
+
+    __slots__ = ('calls', 'time', 'self_time')
+
+    def __init__(self,) -> None:
+        self.calls = 0
+        self.time = 0.0
+        self.self_time = 0.0
+
+    def __repr__(self,) -> str:
+        return (f'<NodeStats calls={self.calls} time={self.time:.6f} '
+                f'self_time={self.self_time:.6f}>')
+
+
+class ValidationStats:
+    """ Collects profiling information about validations. Pass the same
+    object to the `stats` argument of `Validate` (or of any of the file
+    validators) to accumulate the information of many validations.
+
+    `nodes` maps the path pattern of each template node (see
+    `validit.containers.path_pattern`) to its `NodeStats`, so a slow subtree
+    can be found without a profiler.
+    `parse_time` is the time spent parsing files, `validate_time` is the time
+    spent validating the data (which includes dumping it, since both happen
+    in the same pass), and `dump_time` is the time spent dumping data that
+    was validated lazily. `documents` counts the validated documents, and
+    `bytes` counts the parsed bytes, when the size of the input is known.
+
+    If a `callback` is given, it is called with this object after each
+    validated document.
+
+    Instrumented templates are compiled using the `'closures'` backend, and
+    each template node is timed separately, so validations are noticeably
+    slower while they are profiled. A stats object shouldn't be used by
+    multiple threads at the same time. """
+
+    def __init__(self,
+                 callback: typing.Callable[['ValidationStats'], None] = None,
+                 ) -> None:
+        self.callback = callback
+        self._compiled = dict()
+        self._frames = list()
+        self.reset()
+
+    def reset(self,) -> None:
+        """ Drops all of the collected information. """
+        self.nodes: typing.Dict[str, NodeStats] = dict()
+        self.documents = 0
+        self.bytes = 0
+        self.parse_time = 0.0
+        self.validate_time = 0.0
+        self.dump_time = 0.0
+
+    def compile(self, template: 'BaseTemplate') -> CompiledTemplate:
+        """ Returns an instrumented compiled template, that records its
+        information into this object. """
+
+        # Compiled templates are stored by the identity of the template (see
+        # `validit.compiler.Compiler`)
+        entry = self._compiled.get(id(template))
+        if entry is None:
+            compiled = CompiledTemplate(template, 'closures', stats=self)
+            entry = self._compiled[id(template)] = (template, compiled)
+
+        return entry[1]
+
+    def wrap(self, step: Step) -> Step:
+        """ Wraps the given compiled step with a step that records the number
+        of calls and the time spent in it, under its path pattern. """
+
+        frames = self._frames
+        timer = time.perf_counter
+
+        def instrumented(data, link, errors):
+            if frames:
+                parent = frames[-1]
+
+                if parent[0] is link:
+                    # A wrapper of another template (for example,
+                    # `Optional`), which is recorded as a single node
+                    return step(data, link, errors)
+
+                if link is not None and link[0] is parent[0]:
+                    index = link[1]
+                    path = parent[1] + (
+                        '[*]' if isinstance(index, int) else f'[{index}]')
+                else:
+                    path = path_pattern(unlink_path(link))
+
+            else:
+                path = path_pattern(unlink_path(link))
+
+            # The linked path, the path pattern and the time of the children
+            frame = [link, path, 0.0]
+            frames.append(frame)
+            start = timer()
+
+            try:
+                return step(data, link, errors)
+
+            finally:
+                elapsed = timer() - start
+                frames.pop()
+                if frames:
+                    frames[-1][2] += elapsed
+
+                node = self.nodes.get(path)
+                if node is None:
+                    node = self.nodes[path] = NodeStats()
+
+                node.calls += 1
+                node.time += elapsed
+                node.self_time += elapsed - frame[2]
+
+        return instrumented
+
+    def record_parse(self, elapsed: float, size: int = None) -> None:
+        """ Records the parsing of a single document. """
+        self.parse_time += elapsed
+        if size is not None:
+            self.bytes += size
+
+    def record_document(self, elapsed: float) -> None:
+        """ Records the validation of a single document, and calls the
+        callback. """
+
+        self.documents += 1
+        self.validate_time += elapsed
+        if self.callback is not None:
+            self.callback(self)
+
+    def report(self, limit: int = 20) -> str:
+        """ Returns a table of the `limit` template nodes that took the most
+        time (not including the time of their children). """
+
+        lines = [
+            f'{self.documents} documents, {self.bytes} bytes, '
+            f'parse {self.parse_time * 1000:.3f} ms, '
+            f'validate {self.validate_time * 1000:.3f} ms, '
+            f'dump {self.dump_time * 1000:.3f} ms',
+        ]
+
+        nodes = sorted(self.nodes.items(),
+                       key=lambda item: item[1].self_time, reverse=True)
+
+        if nodes:
+            width = max(len(path or '(root)') for path, _ in nodes[:limit])
+            lines.append(
+                f'{"path":<{width}} {"calls":>10} {"total ms":>12} '
+                f'{"self ms":>12}')
+
+        for path, node in nodes[:limit]:
+            lines.append(
+                f'{path or "(root)":<{width}} {node.calls:>10} '
+                f'{node.time * 1000:>12.3f} {node.self_time * 1000:>12.3f}')
+
+        return '\n'.join(lines)
+
+    def __str__(self,) -> str:
+        return self.report()
@@ -0,0 +1,209 @@
+import os
+import hmac
+import pickle
+import shutil
+import typing
+import hashlib
+import secrets
+import tempfile
+
+from validit.exceptions import ValidItError
+from validit.templates.base import BaseTemplate
+from validit.parsers import ParserBackend, get_parser
+from validit.validate import (
+    ValidateFromBuffer,
+    ValidateFromFile,
+    ValidateFromPath,
+    ValidateInformation,
+)
+
+
+class ResultCache:
+    """ Stores the validation results of files in a local directory, so files
+    that haven't changed since they were last validated are not parsed and
+    validated again. The results are identified by a hash of the content of
+    the file, the fingerprint of the template (see
+    `BaseTemplate.fingerprint`), the parser and the version of validit.
+    Files that are validated using templates that can't be fingerprinted
+    are always validated, and their results are not stored.
+
+    The stored errors and data are returned as they were when the file was
+    validated. The original data of stored results is not available.
+
+    Entries are signed using a secret `key`, and entries whose signature
+    doesn't match are ignored, so a cache directory that is shared (or
+    restored from a CI cache) can't be used to run code in the validating
+    process, unless the key is known. If no key is given, a random key is
+    created once and stored in the home directory of the user (see
+    `default_key`). To share the entries between machines, pass the same key
+    (for example, a CI secret) on every machine.
+
+    >>> cache = ResultCache('.validit-cache')
+    >>> valid = cache.validate(template, 'config.yaml')
+    """
+
+    # The path of the key that is used if no key is given
+    KEY_PATH = os.path.join('~', '.validit', 'cache-key')
+
+    def __init__(self,
+                 directory: typing.Union[str, os.PathLike],
+                 key: typing.Union[str, bytes] = None,
+                 ) -> None:
+        self.directory = os.fspath(directory)
+        self.hits = 0
+        self.misses = 0
+
+        if key is None:
+            key = self.default_key()
+        self._key_bytes = key.encode('utf8') if isinstance(key, str) else key
+
+    @classmethod
+    def default_key(cls,) -> bytes:
+        """ Returns the key stored in `KEY_PATH`, and creates a new random key
+        (readable only by the current user) if there is no key yet. """
+
+        path = os.path.expanduser(cls.KEY_PATH)
+        try:
+            with open(path, 'rb') as file:
+                key = file.read()
+            if key:
+                return key
+
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        key = secrets.token_hex(32).encode('ascii')
+
+        # The key file is created only if it doesn't exist yet, so processes
+        # that create it at the same time agree on a single key
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return cls.default_key()
+
+        with os.fdopen(fd, 'wb') as file:
+            file.write(key)
+
+        return key
+
+    def _sign(self, key: str, payload: bytes) -> bytes:
+        """ Returns the signature of a stored entry. The signature covers the
+        key of the entry as well, so entries can't be swapped. """
+        return hmac.new(self._key_bytes, key.encode('utf8') + b'\0' + payload,
+                        hashlib.sha256).digest()
+
+    def _key(self,
+             template: BaseTemplate,
+             content: bytes,
+             backend: ParserBackend,
+             fail_fast: bool,
+             ) -> str:
+
+        # Imported here to avoid a circular import
+        from validit import __version__
+
+        digest = hashlib.sha256()
+        for part in (__version__, template.fingerprint,
+                     backend.filetype, backend.name, str(fail_fast)):
+            digest.update(part.encode('utf8') + b'\0')
+        digest.update(content)
+
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:] + '.pickle')
+
+    def _load(self, key: str) -> typing.Optional[ValidateInformation]:
+        try:
+            with open(self._path(key), 'rb') as file:
+                signature = file.read(hashlib.sha256().digest_size)
+                payload = file.read()
+
+            # Entries are unpickled only if they were stored using the key
+            if not hmac.compare_digest(signature, self._sign(key, payload)):
+                return None
+
+            info = pickle.loads(payload)
+
+        except Exception:
+            # Missing, corrupted and outdated entries are all treated the same
+            # way: the file is validated again, and the entry is replaced.
+            return None
+
+        return info if isinstance(info, ValidateInformation) else None
+
+    def _store(self, key: str, info: ValidateInformation) -> None:
+        try:
+            payload = pickle.dumps(info, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Results that can't be pickled are simply not stored
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # The entry is written into a temporary file first, so other processes
+        # never read a partially written entry.
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(self._sign(key, payload))
+                file.write(payload)
+            os.replace(temp, path)
+
+        except BaseException:
+            os.remove(temp)
+            raise
+
+    def validate(self,
+                 template: BaseTemplate,
+                 path: typing.Union[str, os.PathLike],
+                 filetype: str = None,
+                 title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 ) -> ValidateFromFile:
+        """ Validate the file in the given path using the given template,
+        unless the same content was already validated with the same
+        template. If the format of the file is not given, it is determined by
+        the file extension. """
+
+        if filetype is None:
+            filetype = ValidateFromPath.filetype_of(path)
+
+        backend = get_parser(filetype, parser)
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        try:
+            key = self._key(template, content, backend, fail_fast)
+
+        except ValidItError:
+            # The template can't be fingerprinted, so its results can't be
+            # told apart from the results of other templates
+            return ValidateFromBuffer(
+                template, content, filetype, title, fail_fast, backend)
+
+        info = self._load(key)
+
+        if info is not None:
+            self.hits += 1
+            return ValidateFromFile(template, info, title)
+
+        self.misses += 1
+        result = ValidateFromBuffer(
+            template, content, filetype, title, fail_fast, backend)
+
+        self._store(key, ValidateInformation(
+            errors=result.errors,
+            validated=True,
+            dumped=result.data,
+        ))
+
+        return result
+
+    def clear(self,) -> None:
+        """ Deletes all of the stored results. """
+        shutil.rmtree(self.directory, ignore_errors=True)
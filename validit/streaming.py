@@ -0,0 +1,267 @@
+import json
+import typing
+
+from validit.compiler import defines_compile_method
+from validit.templates.base import BaseTemplate
+from validit.templates.templates import TemplateDict, TemplateList
+from validit.utils import DefaultValue
+
+from validit.errors import TemplateCheckListLengthError
+from validit.errors.managers import (
+    TemplateCheckErrorManager as ErrorManager,
+    TemplateCheckErrorCollection as ErrorCollection,
+)
+
+
+class JSONStreamReader:
+    """ Reads a JSON document from a file in chunks. Values are decoded using
+    the standard `json` decoder, but the reader only keeps the part of the
+    document that hasn't been processed yet in memory.
+
+    Decoding errors are raised as `json.JSONDecodeError` exceptions whose
+    position is relative to the current buffer. Use the `position` method to
+    convert it into a line and a column in the whole document. """
+
+    WHITESPACE = ' \t\n\r'
+    NUMBER = '0123456789.eE+-'
+
+    # Decoding errors this close to the end of the buffer may be caused by a
+    # value that continues in the next chunk.
+    LOOKAHEAD = 64
+
+    def __init__(self, fp: typing.IO, chunk_size: int = 2 ** 16) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+        # The position of the start of the buffer in the document
+        self._line = 1
+        self._column = 0
+
+    def _fill(self, size: int = None) -> None:
+        """ Drops the processed part of the buffer, and reads the next chunk
+        of the file into it. """
+
+        dropped = self._buffer[:self._pos]
+        newlines = dropped.count('\n')
+        if newlines:
+            self._line += newlines
+            self._column = len(dropped) - dropped.rfind('\n') - 1
+        else:
+            self._column += len(dropped)
+
+        chunk = self._fp.read(size or self._chunk_size)
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+    def position(self, pos: int) -> typing.Tuple[int, int]:
+        """ Converts a position in the current buffer into a (line, column)
+        pair in the whole document. Both are counted from one. """
+
+        newlines = self._buffer.count('\n', 0, pos)
+        if newlines:
+            return self._line + newlines, pos - self._buffer.rfind('\n', 0, pos)
+        return self._line, self._column + pos + 1
+
+    def error(self, msg: str) -> json.JSONDecodeError:
+        """ Returns a decoding error in the current position. """
+        return json.JSONDecodeError(msg, self._buffer, self._pos)
+
+    def peek(self,) -> str:
+        """ Skips whitespace, and returns the next character in the document
+        without consuming it. Returns an empty string at the end of the
+        document. """
+
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in self.WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+
+            if self._eof:
+                return ''
+            self._fill()
+
+    def next(self,) -> str:
+        """ Skips whitespace, and consumes and returns the next character. """
+
+        char = self.peek()
+        self._pos += 1
+        return char
+
+    def expect(self, chars: str, msg: str) -> str:
+        """ Consumes the next character, and raises an error if it is not one
+        of the given characters. """
+
+        char = self.peek()
+        if not char or char not in chars:
+            raise self.error(msg)
+
+        self._pos += 1
+        return char
+
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        """ Returns `True` if the decoding error may be caused by a value that
+        continues in the next chunk of the file. """
+
+        return (error.msg.startswith('Unterminated string')
+                or len(self._buffer) - error.pos < self.LOOKAHEAD)
+
+    def _continues(self, end: int) -> bool:
+        """ Returns `True` if a value that was decoded successfully may
+        continue in the next chunk of the file (for example, a number that
+        has been split between two chunks). """
+
+        rest = self._buffer[end:]
+        return len(rest) < self.LOOKAHEAD and all(
+            char in self.NUMBER for char in rest)
+
+    def value(self,) -> typing.Any:
+        """ Decodes and consumes the next value in the document. """
+
+        self.peek()
+        size = self._chunk_size
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+
+            except json.JSONDecodeError as error:
+                if self._eof or not self._truncated(error):
+                    raise
+
+            else:
+                if self._eof or not self._continues(end):
+                    self._pos = end
+                    return value
+
+            # Read larger chunks each time, so decoding a large value doesn't
+            # restart too many times.
+            self._fill(size)
+            size *= 2
+
+    def end(self,) -> None:
+        """ Raises an error if the document contains anything but whitespace
+        after the current position. """
+
+        if self.peek():
+            raise self.error('Extra data')
+
+
+class JSONStreamValidator:
+    """ Validates a JSON document while reading it. Lists and dictionaries in
+    the document that correspond to a `TemplateList` or a `TemplateDict` are
+    not decoded as a whole: each of their elements is decoded, validated and
+    discarded before the next one is read.
+
+    The errors are the same as if the whole document was validated at once,
+    with one exception: the length of a streamed list is only known after all
+    of its elements were validated, so a list length error is registered
+    after the errors of the elements. """
+
+    def __init__(self, reader: JSONStreamReader, errors: ErrorManager) -> None:
+        self._reader = reader
+        self._errors = errors
+
+    @staticmethod
+    def _streams(template: BaseTemplate, cls: type) -> bool:
+        return (isinstance(template, cls)
+                and defines_compile_method(template, '_compile_dump'))
+
+    def validate(self, template: BaseTemplate) -> None:
+        """ Validates the whole document using the given template. """
+        self._value(template, None, self._errors)
+        self._reader.end()
+
+    def _value(self,
+               template: BaseTemplate,
+               link: typing.Any,
+               errors: ErrorManager,
+               ) -> None:
+
+        char = self._reader.peek()
+
+        if char == '[' and self._streams(template, TemplateList):
+            self._list(template, link, errors)
+
+        elif char == '{' and self._streams(template, TemplateDict):
+            self._dict(template, link, errors)
+
+        else:
+            template.compile().dump(self._reader.value(), errors, link)
+
+    def _list(self,
+              template: TemplateList,
+              link: typing.Any,
+              errors: ErrorManager,
+              ) -> None:
+
+        reader = self._reader
+        reader.expect('[', "Expecting '['")
+        count = 0
+
+        if reader.peek() == ']':
+            reader.next()
+
+        else:
+            while True:
+                self._value(template.template, (link, count), errors)
+                count += 1
+
+                if reader.expect(',]', "Expecting ',' delimiter") == ']':
+                    break
+
+        if count not in template.length:
+            errors.register(
+                TemplateCheckListLengthError, DefaultValue, link,
+                expected=template.length, got=count,
+            )
+
+    def _dict(self,
+              template: TemplateDict,
+              link: typing.Any,
+              errors: ErrorManager,
+              ) -> None:
+
+        reader = self._reader
+        reader.expect('{', "Expecting '{'")
+
+        # Errors are registered in the order of the keys in the template,
+        # just like a regular validation. Like `json.load`, only the last
+        # occurrence of a duplicate key counts, so its errors replace the
+        # errors of the previous occurrences.
+        options = ((errors.max_errors, errors.aggregate)
+                   if isinstance(errors, ErrorCollection) else ())
+        collected: typing.Dict[typing.Any, ErrorCollection] = dict()
+
+        if reader.peek() == '}':
+            reader.next()
+
+        else:
+            while True:
+                if reader.peek() != '"':
+                    raise reader.error(
+                        'Expecting property name enclosed in double quotes')
+
+                key = reader.value()
+                reader.expect(':', "Expecting ':' delimiter")
+
+                if key in template.template:
+                    collected[key] = ErrorCollection(*options)
+                    self._value(
+                        template.template[key], (link, key), collected[key])
+                else:
+                    reader.value()
+
+                if reader.expect(',}', "Expecting ',' delimiter") == '}':
+                    break
+
+        for key, element in template.template.items():
+            if key in collected:
+                collected[key].dump_errors(errors)
+            else:
+                element.compile().dump(DefaultValue, errors, (link, key))
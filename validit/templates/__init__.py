@@ -7,4 +7,5 @@ from .templates import (
     TemplateList,
     Optional,
     Options,
+    Cached,
 )
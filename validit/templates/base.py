@@ -1,8 +1,12 @@
+import copy
 import typing
+import hashlib
 from abc import ABC, abstractmethod
 
 from validit.containers import BaseContainer
-from validit.utils import DefaultValue
+from validit.compiler import CompiledTemplate
+from validit.utils import AnyLength, DefaultValue
+from validit.exceptions import ValidItError
 
 from validit.errors.managers import (
     TemplateCheckErrorManager as ErrorManager,
@@ -10,8 +14,189 @@ from validit.errors.managers import (
 )
 
 
+# Values that are described by their `repr`, which represents them exactly
+LITERALS = (type(None), bool, int, float, complex, str, bytes, range)
+
+
+class Identity:
+    """ Describes an object by its identity: two descriptions are equal only
+    if they describe the same object. An identity can't be fingerprinted,
+    unless it has a `portable` description, which is the same in every run
+    of the program. """
+
+    __slots__ = ('value', 'portable')
+
+    def __init__(self, value: typing.Any, portable: str = None) -> None:
+        self.value = value
+        self.portable = portable
+
+    def __eq__(self, other: typing.Any) -> bool:
+        return isinstance(other, Identity) and self.value is other.value
+
+    def __hash__(self,) -> int:
+        return id(self.value)
+
+    def __repr__(self,) -> str:
+        if self.portable is None:
+            raise ValidItError(
+                f"Can't fingerprint {self.value!r}, which can only be "
+                "compared by its identity"
+            )
+        return self.portable
+
+
+class UnorderedItems(frozenset):
+    """ Describes the items of a set. The items are fingerprinted in a sorted
+    order, so the fingerprint doesn't depend on the order of the set. """
+
+    __slots__ = ()
+
+    def __repr__(self,) -> str:
+        return '{' + ', '.join(sorted(repr(item) for item in self)) + '}'
+
+
+def describe(value: typing.Any) -> typing.Any:
+    """ Converts a template argument into a nested tuple, that can be used to
+    compare templates and to fingerprint them. Literals are described by
+    their `repr`, types by their identity (and their qualified name),
+    templates by their structure and collections by their items. Any other
+    object is described by its identity, so it is equal only to itself, and
+    can't be fingerprinted. """
+
+    if isinstance(value, BaseTemplate):
+        return value._structure_key()
+
+    if type(value) in LITERALS:
+        return repr(value)
+
+    if isinstance(value, type):
+        name = f'{value.__module__}.{value.__qualname__}'
+        # Classes that are created inside functions may share a name
+        return Identity(value, None if '<locals>' in name else name)
+
+    if isinstance(value, AnyLength):
+        return describe(AnyLength)
+
+    # Collections are described by their type and their items, so different
+    # collections of the same items are not confused
+    if isinstance(value, (list, tuple)):
+        items = tuple(describe(item) for item in value)
+
+    elif isinstance(value, dict):
+        items = tuple(
+            description
+            for key, item in value.items()
+            for description in (describe(key), describe(item))
+        )
+
+    elif isinstance(value, (set, frozenset)):
+        items = (UnorderedItems(describe(item) for item in value),)
+
+    else:
+        return Identity(value)
+
+    return (describe(type(value)),) + items
+
+
+def _replace_templates(value: typing.Any,
+                       replace: typing.Callable[['BaseTemplate'], 'BaseTemplate'],
+                       ) -> typing.Any:
+    """ Returns the given value, in which each template is replaced with the
+    template returned by `replace`. Lists, tuples, sets and dictionaries that
+    contain replaced templates are copied, and other values are returned as
+    they are. """
+
+    if isinstance(value, BaseTemplate):
+        return replace(value)
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        old = list(value)
+        new = [_replace_templates(item, replace) for item in old]
+
+    elif isinstance(value, dict):
+        old = list(value.items())
+        new = [
+            (_replace_templates(key, replace), _replace_templates(item, replace))
+            for key, item in old
+        ]
+        if all(a is b for pair in zip(new, old) for a, b in zip(*pair)):
+            return value
+
+    else:
+        return value
+
+    if all(a is b for a, b in zip(new, old)):
+        return value
+
+    return type(value)(new)
+
+
+def bottom_up(template: 'BaseTemplate',
+              skip: typing.Callable[['BaseTemplate'], bool] = None,
+              ) -> typing.List['BaseTemplate']:
+    """ Returns the given template and all of its sub-templates (see
+    `BaseTemplate._sub_templates`), where each template appears once, after
+    all of its sub-templates. Templates for which `skip` returns `True` are
+    left out, together with their sub-templates. The tree is walked without
+    recursion, so it can be nested as deep as needed. """
+
+    order, seen = list(), set()
+    # Each item is a template, and whether its sub-templates were added
+    stack = [(template, False)]
+
+    while stack:
+        current, expanded = stack.pop()
+
+        if expanded:
+            order.append(current)
+            continue
+
+        if id(current) in seen or (skip is not None and skip(current)):
+            continue
+
+        seen.add(id(current))
+        stack.append((current, True))
+        stack.extend((child, False) for child in current._sub_templates())
+
+    return order
+
+
+def serialize(structure: tuple) -> str:
+    """ Returns the `repr` of the given structure (see `describe`). Nested
+    tuples are serialized without recursing once for each level, so the
+    structures of deeply nested templates can be serialized as well. """
+
+    parts = list()
+    # Each item is a value that should be serialized, or a piece of text
+    # (marked by `True`) that should be added as it is.
+    stack = [(structure, False)]
+
+    while stack:
+        value, text = stack.pop()
+
+        if text:
+            parts.append(value)
+
+        elif type(value) is tuple:
+            stack.append((',)' if len(value) == 1 else ')', True))
+            for index in range(len(value) - 1, -1, -1):
+                stack.append((value[index], False))
+                if index:
+                    stack.append((', ', True))
+            parts.append('(')
+
+        else:
+            parts.append(repr(value))
+
+    return ''.join(parts)
+
+
 class BaseTemplate(ABC):
 
+    # Attributes that cache information that is computed from the template,
+    # and are not a part of the template itself
+    _CACHED_ATTRIBUTES = ('_compiled', '_structure_cache', '_hash')
+
     @abstractmethod
     def container_dump(self,
                        container: BaseContainer,
@@ -29,3 +214,148 @@ class BaseTemplate(ABC):
         """ Preforms a validation check that validates if the given data
         follows the defined template. Returns an error manager object that
         contains a record of all mismatches. """
+
+    def compile(self,) -> CompiledTemplate:
+        """ Compiles the template into a flat plan that dumps and validates
+        data in a single pass. Templates can't be changed after they are
+        created, so the compiled plan is created only once and reused. """
+
+        compiled = getattr(self, '_compiled', None)
+        if compiled is None:
+            compiled = self._compiled = CompiledTemplate(self)
+        return compiled
+
+    def _structure(self,) -> tuple:
+        """ Returns a nested tuple that describes the type of the template and
+        all of its attributes (see `describe`). Two templates with the same
+        structure validate data in the same way. """
+
+        structure = [describe(type(self))]
+        for name, value in sorted(self._attributes().items()):
+            structure += (name, self._describe_attribute(name, value))
+        return tuple(structure)
+
+    def _attributes(self,) -> typing.Dict[str, typing.Any]:
+        """ Returns the attributes of the template, including attributes that
+        are stored in slots, except for the cached attributes. """
+
+        attributes = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            slots = vars(cls).get('__slots__', ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name in ('__dict__', '__weakref__'):
+                    continue
+                if name.startswith('__') and not name.endswith('__'):
+                    # Private names are mangled
+                    name = f"_{cls.__name__.lstrip('_')}{name}"
+                if hasattr(self, name):
+                    attributes[name] = getattr(self, name)
+
+        for name in self._CACHED_ATTRIBUTES:
+            attributes.pop(name, None)
+
+        return attributes
+
+    def _describe_attribute(self, name: str, value: typing.Any) -> typing.Any:
+        """ Returns the description of an attribute of the template, that is
+        a part of its structure. Templates can override this to describe
+        attributes that `describe` can't describe well. """
+        return describe(value)
+
+    def _structure_key(self,) -> tuple:
+        """ Returns the structure of the template (see `_structure`).
+        Templates can't be changed after they are created, so the structure
+        is computed only once. """
+
+        structure = getattr(self, '_structure_cache', None)
+        if structure is not None:
+            return structure
+
+        # The structures of the sub-templates are computed first, from the
+        # deepest one up, so describing a deeply nested template doesn't
+        # recurse once for each level of the tree
+        for template in bottom_up(self, skip=lambda template: getattr(
+                template, '_structure_cache', None) is not None):
+            template._structure_cache = template._structure()
+
+        return self._structure_cache
+
+    def _sub_templates(self,) -> typing.List['BaseTemplate']:
+        """ Returns the templates that are stored in the attributes of the
+        template, including templates inside lists, tuples, sets and
+        dictionaries. """
+
+        templates = list()
+        values = list(self._attributes().values())
+
+        while values:
+            value = values.pop()
+            if isinstance(value, BaseTemplate):
+                templates.append(value)
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                values.extend(value)
+            elif isinstance(value, dict):
+                values.extend(value.keys())
+                values.extend(value.values())
+
+        return templates
+
+    def _replace_children(self,
+                          replace: typing.Callable[['BaseTemplate'], 'BaseTemplate'],
+                          ) -> 'BaseTemplate':
+        """ Returns a copy of the template, in which each of the sub-templates
+        (see `_sub_templates`) is replaced with the template returned by
+        `replace` (see `validit.interning`). If no sub-template is replaced,
+        returns the template itself. The template itself is never changed. """
+
+        attributes = self._attributes()
+        changed = {
+            name: replaced
+            for name, value in attributes.items()
+            for replaced in (_replace_templates(value, replace),)
+            if replaced is not value
+        }
+
+        if not changed:
+            return self
+
+        clone = copy.copy(self)
+        for name, value in {**attributes, **changed}.items():
+            object.__setattr__(clone, name, value)
+
+        return clone
+
+    @property
+    def fingerprint(self,) -> str:
+        """ A hash of the structure of the template, which is the same in
+        every run of the program. Raises a `ValidItError` if one of the
+        arguments of the template can only be compared by its identity (see
+        `describe`), since it can't be fingerprinted. """
+
+        structure = serialize(self._structure_key()).encode('utf8')
+        return hashlib.sha256(structure).hexdigest()
+
+    def __eq__(self, other: typing.Any) -> bool:
+        """ Templates are equal if they have the same structure: the same
+        type, and equal arguments. """
+
+        if not isinstance(other, BaseTemplate):
+            return NotImplemented
+        return (self is other
+                or self._structure_key() == other._structure_key())
+
+    def __hash__(self,) -> int:
+        value = getattr(self, '_hash', None)
+        if value is None:
+            value = self._hash = hash(self._structure_key())
+        return value
+
+    def __getstate__(self,) -> dict:
+        """ The compiled plan can't be pickled, and is recreated when the
+        unpickled template is first used. Other cached information is
+        recomputed as well. """
+
+        state = self.__dict__.copy()
+        for name in self._CACHED_ATTRIBUTES:
+            state.pop(name, None)
+        return state
@@ -1,13 +1,13 @@
 import typing
 
-from copy import deepcopy
+from copy import copy, deepcopy
 
 from validit.errors.managers import (
     TemplateCheckErrorManager as ErrorManager,
-    TemplateCheckErrorCollection as ErrorCollection,
     TemplateCheckRaiseOnError as RaiseOnErrorManager,
 )
 
+from validit.errors.errors import readable_list
 from validit.errors import (
     TemplateCheckError,
     TemplateCheckInvalidOptionError,
@@ -16,14 +16,20 @@ from validit.errors import (
     TemplateCheckListLengthError,
 )
 
-from .base import BaseTemplate
+from .base import BaseTemplate, Identity
 
 from validit.containers import (
     BaseContainer,
     HeadContainer,
 )
 
-from validit.exceptions import InvalidTemplateConfiguration, InvalidDefaultValue
+from validit.cache import ValidationCache
+from validit.compiler import CompiledTemplate
+from validit.exceptions import (
+    ValidItError,
+    InvalidTemplateConfiguration,
+    InvalidDefaultValue,
+)
 from validit.utils import AnyLength, DefaultValue
 
 
@@ -31,6 +37,20 @@ def classname(instance):
     return type(instance).__name__
 
 
+# Equal numbers of different types (like `1`, `1.0` and `True`) are different
+# options, so `Options` stores them together with their type.
+NUMERIC_TYPES = frozenset((bool, int, float, complex))
+
+
+def _option_key(value: typing.Any) -> typing.Any:
+    """ Returns the key that represents the given option (or data) in the
+    set of the hashable options. """
+
+    if value.__class__ in NUMERIC_TYPES:
+        return value.__class__, value
+    return value
+
+
 class Template(BaseTemplate):
 
     def __init__(self, *types: type):
@@ -55,13 +75,22 @@ class Template(BaseTemplate):
                  container: BaseContainer,
                  errors: ErrorManager,
                  ) -> None:
+        self._validate_type(container, errors)
+
+    def _validate_type(self,
+                       container: BaseContainer,
+                       errors: ErrorManager,
+                       ) -> bool:
+        """ Checks that the data is an instance of one of the template types.
+        Returns `True` only if no error has been registered. """
 
         if container.data is DefaultValue:
             errors.register_error(
                 TemplateCheckMissingDataError(container)
             )
+            return False
 
-        elif not isinstance(container.data, self.types):
+        if not isinstance(container.data, self.types):
             # If the given data is not an instance of the allowed types,
             # an error is registered.
             errors.register_error(TemplateCheckInvalidDataError(
@@ -69,17 +98,120 @@ class Template(BaseTemplate):
                 expected=self.types,
                 got=container.data,
             ))
+            return False
 
+        return True
 
-class TemplateAny(Template):
+    def _compile_dump(self, compiler):
+        types = self.types
 
-    def __init__(self,):
+        def step(data, link, errors):
+            if data is DefaultValue:
+                errors.register(TemplateCheckMissingDataError, data, link)
+
+            elif not isinstance(data, types):
+                errors.register(
+                    TemplateCheckInvalidDataError, data, link,
+                    expected=types, got=data,
+                )
+
+            return data
+
+        return step
+
+    def _generate_code(self, generator, data, link, out):
+        types = generator.constant(self.types, 'types')
+
+        generator.emit(f'if {data} is DefaultValue:')
+        with generator.block():
+            generator.register_error(TemplateCheckMissingDataError, data, link)
+
+        generator.emit(f'elif not isinstance({data}, {types}):')
+        with generator.block():
+            generator.register_error(
+                TemplateCheckInvalidDataError, data, link,
+                expected=types, got=data,
+            )
+
+        generator.output(out, data)
+
+    def _generate(self, generator):
+        return generator.instance(self.types)
+
+    def _generate_invalid(self, generator):
+        return generator.other_instance(self.types)
+
+
+class TemplateAny(Template):
+    """ A template that accepts any data. The `copy` argument determines how
+    the data is dumped: `'share'` (the default) dumps a reference to the
+    original data, `'shallow'` dumps a shallow copy of it, and `'deep'`
+    dumps a deep copy of it. Use one of the copying policies if the dumped
+    data is modified, and the original data shouldn't change. """
+
+    COPY_POLICIES = {
+        'share': None,
+        'shallow': copy,
+        'deep': deepcopy,
+    }
+
+    def __init__(self, copy: str = 'share'):
         super().__init__(object)
+        self.copy = copy
+
+        if copy not in self.COPY_POLICIES:
+            raise InvalidTemplateConfiguration(
+                f"Unknown copy policy {copy!r}, expected " +
+                readable_list(list(self.COPY_POLICIES))
+            )
+
+    @property
+    def _copier(self,) -> typing.Optional[typing.Callable]:
+        return self.COPY_POLICIES[self.copy]
 
     def container_dump(self,
                        container: BaseContainer,
                        data=DefaultValue) -> None:
-        container.data = deepcopy(data)
+        if data is not DefaultValue:
+            copier = self._copier
+            container.data = data if copier is None else copier(data)
+
+    def _compile_dump(self, compiler):
+        copier = self._copier
+
+        def step(data, link, errors):
+            if data is DefaultValue:
+                errors.register(TemplateCheckMissingDataError, data, link)
+                return data
+
+            return data if copier is None else copier(data)
+
+        return step
+
+    def _generate_code(self, generator, data, link, out):
+        copier = self._copier
+
+        generator.emit(f'if {data} is DefaultValue:')
+        with generator.block():
+            generator.register_error(TemplateCheckMissingDataError, data, link)
+            if copier is not None:
+                generator.output(out, data)
+
+        if copier is None:
+            generator.output(out, data)
+
+        elif generator.dumps:
+            copier = generator.constant(copier, self.copy)
+            generator.emit('else:')
+            with generator.block():
+                generator.output(out, f'{copier}({data})')
+
+    def _generate(self, generator):
+        return generator.blob()
+
+    def _generate_invalid(self, generator):
+        # Only missing data doesn't match this template
+        return DefaultValue
 
 
 class Optional(BaseTemplate):
@@ -130,9 +262,59 @@ class Optional(BaseTemplate):
             # if data is not given (data=Default), skips the check!
             self.__template.validate(container, errors)
 
+    def _compile_dump(self, compiler):
+        default = self.__default
+        inner = compiler.dump_step(self.__template)
+
+        def step(data, link, errors):
+            if data is DefaultValue:
+                data = default
+            if data is not DefaultValue:
+                # The optional template doesn't dump the data using the inner
+                # template, only validates it.
+                inner(data, link, errors)
+            return data
+
+        return step
+
+    def _generate_code(self, generator, data, link, out):
+        default = generator.constant(self.__default, 'default')
+
+        generator.emit(f'if {data} is DefaultValue:')
+        with generator.block():
+            generator.emit(f'{data} = {default}')
+
+        generator.emit(f'if {data} is not DefaultValue:')
+        with generator.block():
+            generator.node(
+                self.__template, data, link,
+                out=generator.variable('ignored'),
+            )
+
+        generator.output(out, data)
+
+    def _generate(self, generator):
+        if generator.random.random() < generator.optional_rate:
+            # The data is missing
+            return DefaultValue
+        return generator.generate(self.__template)
+
+    def _generate_invalid(self, generator):
+        data = generator.invalid(self.__template)
+        if data is DefaultValue:
+            # Missing data is valid when the template is optional
+            raise ValidItError(
+                f"Can't generate invalid data for '{classname(self)}' "
+                f"of '{classname(self.__template)}'"
+            )
+        return data
+
 
 class TemplateList(Template):
 
+    # The results of lists can be stored in a validation cache
+    _cacheable = True
+
     def __init__(self, template: Template, valid_lengths: typing.Any = AnyLength()):
         super().__init__(list, tuple)
         self.template = template
@@ -156,9 +338,10 @@ class TemplateList(Template):
                        ) -> None:
 
         if not isinstance(data, (list, tuple)):
-            # If data is not a list (maybe default value)
-            # contanier will remain with default value.
-            container.data = data
+            # If data is not a list, it is dumped as it is. Missing data is
+            # not dumped at all, so the container remains empty.
+            if data is not DefaultValue:
+                container.data = data
             return
 
         container.data = list()
@@ -179,31 +362,107 @@ class TemplateList(Template):
                  ) -> None:
 
         # Check if data is a list
-        temp_errors = ErrorCollection()
-        super().validate(container, temp_errors)
+        if not self._validate_type(container, errors):
+            return
+
+        if len(container.data) not in self.length:
+            errors.register_error(TemplateCheckListLengthError(
+                container=container,
+                expected=self.length,
+                got=len(container.data),
+            ))
 
-        if temp_errors:
-            temp_errors.dump_errors(errors)
+        # For each element in the list,
+        # check if it follows the element template
+        for cur in container:
+            self.template.validate(
+                container=cur,
+                errors=errors,
+            )
 
-        else:
-            if len(container.data) not in self.length:
-                errors.register_error(TemplateCheckListLengthError(
-                    container=container,
-                    expected=self.length,
-                    got=len(container.data),
-                ))
-
-            # For each element in the list,
-            # check if it follows the element template
-            for cur in container:
-                self.template.validate(
-                    container=cur,
-                    errors=errors,
+    def _compile_dump(self, compiler):
+        check_type = super()._compile_dump(compiler)
+        length = self.length
+        element = compiler.dump_step(self.template)
+
+        def step(data, link, errors):
+            if not isinstance(data, (list, tuple)):
+                return check_type(data, link, errors)
+
+            if len(data) not in length:
+                errors.register(
+                    TemplateCheckListLengthError, data, link,
+                    expected=length, got=len(data),
                 )
 
+            return [
+                element(cur, (link, index), errors)
+                for index, cur in enumerate(data)
+            ]
+
+        return step
+
+    def _generate_code(self, generator, data, link, out):
+        generator.emit(f'if isinstance({data}, (list, tuple)):')
+        with generator.block():
+
+            if not isinstance(self.length, AnyLength):
+                length = generator.constant(self.length, 'length')
+                generator.emit(f'if len({data}) not in {length}:')
+                with generator.block():
+                    generator.register_error(
+                        TemplateCheckListLengthError, data, link,
+                        expected=length, got=f'len({data})',
+                    )
+
+            index = generator.variable('index')
+            element = generator.variable('element')
+            dumped = generator.variable('dumped')
+
+            generator.output(out, '[]')
+            generator.emit(f'for {index}, {element} in enumerate({data}):')
+            with generator.block():
+                generator.node(
+                    self.template, element, f'({link}, {index})', dumped)
+                if generator.dumps:
+                    generator.emit(f'{out}.append({dumped})')
+
+        generator.emit('else:')
+        with generator.block():
+            super()._generate_code(generator, data, link, out)
+
+    def _generate(self, generator):
+        return [
+            generator.generate(self.template)
+            for _ in range(generator.length(self.length))
+        ]
+
+    def _generate_invalid(self, generator):
+        data = self._generate(generator)
+
+        # Usually, a single invalid element in a valid list
+        if data and generator.random.random() < 0.8:
+            try:
+                element = generator.invalid(self.template)
+            except ValidItError:
+                element = DefaultValue
+
+            if element is not DefaultValue:
+                data[int(generator.random.random() * len(data))] = element
+                return data
+
+        length = generator.invalid_length(self.length)
+        if length is not None:
+            return [generator.generate(self.template) for _ in range(length)]
+
+        return super()._generate_invalid(generator)
+
 
 class TemplateDict(Template):
 
+    # The results of dictionaries can be stored in a validation cache
+    _cacheable = True
+
     def __init__(self, **template):
         super().__init__(dict)
         self.template = template
@@ -229,9 +488,10 @@ class TemplateDict(Template):
                        ) -> None:
 
         if not isinstance(data, dict):
-            # If data is not a dict (maybe default value)
-            # contanier will remain with default value.
-            container.data = data
+            # If data is not a dict, it is dumped as it is. Missing data is
+            # not dumped at all, so the container remains empty.
+            if data is not DefaultValue:
+                container.data = data
             return
 
         container.data = dict()
@@ -247,19 +507,86 @@ class TemplateDict(Template):
                  ) -> None:
 
         # Check if the data is a dictionary
-        temp_errors = ErrorCollection()
-        super().validate(container, temp_errors)
+        if not self._validate_type(container, errors):
+            return
 
-        if temp_errors:
-            temp_errors.dump_errors(errors)
+        # If no errors in the type check, run actual validation
+        for key, template in self.template.items():
+            template.validate(
+                container=container[key],
+                errors=errors,
+            )
+
+    def _compile_dump(self, compiler):
+        check_type = super()._compile_dump(compiler)
+        items = tuple(
+            (key, compiler.dump_step(template))
+            for key, template in self.template.items()
+        )
+
+        def step(data, link, errors):
+            if not isinstance(data, dict):
+                return check_type(data, link, errors)
+
+            dumped = dict()
+            for key, element in items:
+                value = element(data.get(key, DefaultValue), (link, key), errors)
+                if value is not DefaultValue:
+                    dumped[key] = value
+
+            return dumped
+
+        return step
+
+    def _generate_code(self, generator, data, link, out):
+        generator.emit(f'if isinstance({data}, dict):')
+        with generator.block():
+            generator.output(out, '{}')
 
-        else:
-            # If no errors in super validation check, run actual validation
             for key, template in self.template.items():
-                template.validate(
-                    container=container[key],
-                    errors=errors,
-                )
+                value = generator.variable('value')
+                dumped = generator.variable('dumped')
+
+                generator.emit(f'{value} = {data}.get({key!r}, DefaultValue)')
+                generator.node(template, value, f'({link}, {key!r})', dumped)
+                if generator.dumps:
+                    generator.emit(f'if {dumped} is not DefaultValue:')
+                    with generator.block():
+                        generator.emit(f'{out}[{key!r}] = {dumped}')
+
+        generator.emit('else:')
+        with generator.block():
+            super()._generate_code(generator, data, link, out)
+
+    def _generate(self, generator):
+        data = dict()
+        for key, template in self.template.items():
+            value = generator.generate(template)
+            if value is not DefaultValue:
+                data[key] = value
+        return data
+
+    def _generate_invalid(self, generator):
+        data = self._generate(generator)
+
+        # Usually, a single invalid value in a valid dictionary
+        if generator.random.random() < 0.8:
+            keys = list(self.template)
+            generator.random.shuffle(keys)
+
+            for key in keys:
+                try:
+                    value = generator.invalid(self.template[key])
+                except ValidItError:
+                    continue
+
+                if value is DefaultValue:
+                    data.pop(key, None)
+                else:
+                    data[key] = value
+                return data
+
+        return super()._generate_invalid(generator)
 
 
 class Options(BaseTemplate):
@@ -268,27 +595,175 @@ class Options(BaseTemplate):
     This is useful in some cases where the options are pre-defined and limited.
 
     For example: `Options('L', 'R')` to allow the data to only be strings that
-    represent directions. """
+    represent directions.
+
+    Hashable options are stored in a set, so checking the data takes the same
+    time for any number of options. Numbers (and booleans) must also match
+    the type of the option, so for example `Options(1)` doesn't accept `1.0`
+    or `True`. """
 
     def __init__(self, *instances: typing.Any):
         self.instances = instances
 
+        hashable, unhashable = list(), list()
+        for instance in instances:
+            try:
+                hash(instance)
+            except TypeError:
+                unhashable.append(instance)
+            else:
+                hashable.append(_option_key(instance))
+
+        self._hashable = frozenset(hashable)
+        self._unhashable = tuple(unhashable)
+
+    def _contains(self, data: typing.Any) -> bool:
+        """ Returns `True` only if the data is equal to one of the options. """
+
+        try:
+            if _option_key(data) in self._hashable:
+                return True
+        except TypeError:
+            # The data is unhashable, so it can only be equal to one of the
+            # unhashable options.
+            pass
+
+        return data in self._unhashable
+
     def container_dump(self,
                        container: BaseContainer,
                        data: typing.Any = DefaultValue,
                        ) -> None:
-        container.data = data
+        if data is not DefaultValue:
+            container.data = data
 
     def validate(self,
                  container: BaseContainer,
                  errors: ErrorManager,
                  ) -> None:
-        for cur in self.instances:
-            if cur is container.data:
-                return
+        if self._contains(container.data):
+            return
 
         errors.register_error(TemplateCheckInvalidOptionError(
             container=container,
             expected=self.instances,
             got=container.data,
         ))
+
+    def _compile_dump(self, compiler):
+        instances = self.instances
+        contains = self._contains
+
+        def step(data, link, errors):
+            if not contains(data):
+                errors.register(
+                    TemplateCheckInvalidOptionError, data, link,
+                    expected=instances, got=data,
+                )
+
+            return data
+
+        return step
+
+    def _generate_code(self, generator, data, link, out):
+        instances = generator.constant(self.instances, 'instances')
+        hashable = generator.constant(self._hashable, 'options')
+        numeric = generator.constant(NUMERIC_TYPES, 'numeric')
+        found = generator.variable('found')
+        key = (f'(({data}.__class__, {data}) if {data}.__class__ in {numeric}'
+               f' else {data})')
+
+        generator.emit('try:')
+        with generator.block():
+            generator.emit(f'{found} = {key} in {hashable}')
+        generator.emit('except TypeError:')
+        with generator.block():
+            generator.emit(f'{found} = False')
+
+        if self._unhashable:
+            unhashable = generator.constant(self._unhashable, 'unhashable')
+            generator.emit(f'if not {found}:')
+            with generator.block():
+                generator.emit(f'{found} = {data} in {unhashable}')
+
+        generator.emit(f'if not {found}:')
+        with generator.block():
+            generator.register_error(
+                TemplateCheckInvalidOptionError, data, link,
+                expected=instances, got=data,
+            )
+
+        generator.output(out, data)
+
+    def _generate(self, generator):
+        return generator.choice(self.instances)
+
+    def _generate_invalid(self, generator):
+        for _ in range(100):
+            data = generator.scalar()
+            if not self._contains(data):
+                return data
+
+        # Missing data is never one of the options
+        return DefaultValue
+
+
+class Cached(BaseTemplate):
+    """ Validates the data using the given template, and remembers the lists
+    and dictionaries in the data that were found to be valid (see
+    `validit.cache.ValidationCache`). When the same list or dictionary object
+    appears again (for example, a YAML anchor that is referenced many times,
+    or a shared block of default values), its previous result is reused
+    instead of validating it again.
+
+    For example: `Cached(TemplateList(record), maxsize=4096)`. The cache is
+    available using the `cache` attribute. Data that is stored in the cache
+    shouldn't be modified, and the dumped data of repeated objects is shared
+    as well. """
+
+    def __init__(self,
+                 template: BaseTemplate,
+                 maxsize: typing.Optional[int] = 1024,
+                 ) -> None:
+        self.template = template
+        self.cache = ValidationCache(maxsize)
+
+        if not isinstance(template, BaseTemplate):
+            raise InvalidTemplateConfiguration(
+                f"The '{classname(self)}' constructor accepts Templates, " +
+                f"not '{classname(template)}'"
+            )
+
+    def container_dump(self,
+                       container: BaseContainer,
+                       data: typing.Any = DefaultValue,
+                       ) -> None:
+        self.template.container_dump(container, data)
+
+    def validate(self,
+                 container: BaseContainer,
+                 errors: ErrorManager,
+                 ) -> None:
+        self.template.validate(container, errors)
+
+    def _describe_attribute(self, name, value):
+        if name == 'cache':
+            # Wrappers are equal only if they share the same cache. The cache
+            # doesn't change the validation results, so it is fingerprinted
+            # in the same way in any wrapper.
+            return Identity(value, 'ValidationCache')
+        return super()._describe_attribute(name, value)
+
+    def _compile_dump(self, compiler):
+        dump = CompiledTemplate(self.template, cache=self.cache).dump
+
+        def step(data, link, errors):
+            return dump(data, errors, link)
+
+        return step
+
+    def _generate(self, generator):
+        return generator.generate(self.template)
+
+    def _generate_invalid(self, generator):
+        return generator.invalid(self.template)
@@ -1,18 +1,26 @@
+import os
+import json
+import mmap
+import time
 import typing
+import itertools
 
 from dataclasses import dataclass, field
 from termcolor import colored
 
-from validit.errors.managers import TemplateCheckErrorCollection as ErrorCollection
+from validit.errors import TemplateCheckError
+from validit.errors.managers import (
+    TemplateCheckErrorCollection as ErrorCollection,
+    TemplateCheckRaiseOnError as RaiseOnErrorManager,
+)
 from validit.templates.base import BaseTemplate
 from validit.containers import HeadContainer
-from validit.utils import ExtraModules
-
-from validit.errors.parsing import (
-    JsonParsingError,
-    YamlParsingError,
-    TomlParsingError,
-)
+from validit.utils import DefaultValue
+from validit.streaming import JSONStreamReader, JSONStreamValidator
+from validit.parsers import Buffer, ParserBackend, get_parser
+from validit.profiling import ValidationStats
+from validit.exceptions import ValidItError
+from validit.errors.parsing import JsonParsingError
 
 
 @dataclass
@@ -27,25 +35,82 @@ class ValidateInformation:
     errors: ErrorCollection = field(default_factory=ErrorCollection)
     fatal_error: bool = False
 
+    # Set if the data has already been validated while it was loaded, and the
+    # errors are already registered.
+    validated: bool = False
+
+    # The dumped data, if it was already created while the data was validated
+    dumped: typing.Any = DefaultValue
+
+
+def is_valid(template: BaseTemplate, data: typing.Any) -> bool:
+    """ Returns `True` only if the given data follows the given template.
+    Stops at the first mismatch, and doesn't create any error objects or dump
+    the data. Use this if you don't need to know why the data is invalid. """
+    return template.compile().test(data)
+
 
 class Validate:
 
     def __init__(self,
                  template: BaseTemplate,
-                 data: typing.Union[ValidateInformation, typing.Any]
+                 data: typing.Union[ValidateInformation, typing.Any],
+                 fail_fast: bool = False,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
                  ) -> None:
-        """ Validate the given data with the given template. """
+        """ Validate the given data with the given template. If `fail_fast` is
+        set, the validation stops at the first error: only the first error is
+        registered, and the data is not dumped.
+
+        If `lazy` is set, the original data is only validated, and the dumped
+        data is created only when the `data` property is first accessed. This
+        is faster if only the errors are needed, but the original data
+        shouldn't be modified before the `data` property is accessed.
+
+        If a `ValidationStats` object is given, the validation is profiled,
+        and its timing is recorded into the object. If `max_errors` is given,
+        only the first `max_errors` errors are stored, and the rest of the
+        errors are only counted (see `TemplateCheckErrorCollection`). """
 
         if not isinstance(data, ValidateInformation):
             data = ValidateInformation(data=data)
 
+        if max_errors is not None:
+            data.errors.max_errors = max_errors
+
         self._info: ValidateInformation = data
-        self._data: HeadContainer = HeadContainer()
+        self._data: HeadContainer = HeadContainer(self._info.dumped)
         self._template: BaseTemplate = template
+        self._lazy: bool = False
+        self._stats: ValidationStats = stats
+
+        if self._info.fatal_error or self._info.validated:
+            return
 
-        if not self._info.fatal_error:
-            template.container_dump(self._data, self._info.data)
-            template.validate(self._data, self._info.errors)
+        if stats is None:
+            compiled = template.compile()
+        else:
+            compiled = stats.compile(template)
+            start = time.perf_counter()
+
+        errors = RaiseOnErrorManager() if fail_fast else self._info.errors
+
+        try:
+            if lazy:
+                compiled.check(self._info.data, errors)
+                self._lazy = True
+            else:
+                self._data.data = compiled.dump(self._info.data, errors)
+
+        except TemplateCheckError as error:
+            if not fail_fast:
+                raise
+            self._info.errors.register_error(error)
+
+        if stats is not None:
+            stats.record_document(time.perf_counter() - start)
 
     @property
     def template(self,) -> BaseTemplate:
@@ -63,6 +128,18 @@ class Validate:
         """ The user data after it has been parsed. Data that is not required
         by the template is removed, and data that is not provided by the user
         but has a default value will be included. """
+
+        if self._lazy:
+            start = time.perf_counter()
+
+            # The errors were already registered when the data was validated
+            self._data.data = self._template.compile().dump(
+                self._info.data, ErrorCollection())
+            self._lazy = False
+
+            if self._stats is not None:
+                self._stats.dump_time += time.perf_counter() - start
+
         return self._data.data
 
     @property
@@ -80,13 +157,43 @@ class ValidateFromFile(Validate):
                  template: BaseTemplate,
                  data: ValidateInformation,
                  title: str = None,
+                 fail_fast: bool = False,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
                  ) -> None:
         """ Recives an open file (or file-like) object. Reads the data from it,
         parses it with the corresponding format and returns the validation
         results. """
 
         self.__title = title
-        super().__init__(template, data)
+        super().__init__(template, data, fail_fast, lazy, stats, max_errors)
+
+    @staticmethod
+    def _parse(backend: ParserBackend,
+               load: typing.Callable[[], typing.Any],
+               stats: ValidationStats = None,
+               size: int = None,
+               ) -> ValidateInformation:
+        """ Loads the data using the given function, and converts parsing
+        errors of the backend into a file parsing error. If a stats object is
+        given, the parsing time and the size of the input (if it is known)
+        are recorded into it. """
+
+        info = ValidateInformation()
+        start = time.perf_counter()
+
+        try:
+            info.data = load()
+
+        except backend.errors as error:
+            info.fatal_error = True
+            info.errors.register_error(backend.parsing_error(error))
+
+        if stats is not None:
+            stats.record_parse(time.perf_counter() - start, size)
+
+        return info
 
     def __str__(self) -> str:
         """ Returns a string colored that represents the template error check
@@ -107,77 +214,347 @@ class ValidateFromJSON(ValidateFromFile):
                  template: BaseTemplate,
                  fp: typing.IO,
                  title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
                  ) -> None:
-        """ Validate data from a JSON file, using a user-made template. """
+        """ Validate data from a JSON file, using a user-made template.
+        The file is parsed using the `json` module, unless a faster parser
+        is requested (for example, `parser='orjson'`). """
 
-        extras = ExtraModules(
-            class_name=self.__class__.__name__,
-            extra_name='json',
-            module_names=('json',),
-        )
+        backend = get_parser('json', parser)
+        info = self._parse(backend, lambda: backend.load(fp), stats)
+        super().__init__(template, info, title, fail_fast, lazy, stats,
+                         max_errors)
 
-        info = ValidateInformation()
 
-        try:
-            info.data = extras.json.load(fp)
+class ValidateFromBuffer(ValidateFromFile):
 
-        except extras.json.JSONDecodeError as error:
-            info.fatal_error = True
-            info.errors.register_error(JsonParsingError(error))
+    def __init__(self,
+                 template: BaseTemplate,
+                 buffer: Buffer,
+                 filetype: str = 'json',
+                 title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
+                 ) -> None:
+        """ Validate data from a bytes-like object (`bytes`, `bytearray`,
+        `memoryview` or `mmap`) that contains an UTF-8 encoded file of the
+        given format (`'json'`, `'yaml'` or `'toml'`). Only the `orjson`
+        parser parses the raw bytes directly; the other parsers (including
+        the default JSON and TOML parsers) decode the whole document into a
+        string first. """
+
+        backend = get_parser(filetype, parser)
+
+        size = None
+        if stats is not None:
+            with memoryview(buffer) as view:
+                size = view.nbytes
+
+        info = self._parse(
+            backend, lambda: backend.loads_buffer(buffer), stats, size)
+        super().__init__(template, info, title, fail_fast, lazy, stats,
+                         max_errors)
+
+
+class ValidateFromPath(ValidateFromBuffer):
+
+    # The file format that corresponds to each file extension
+    FILETYPES = {
+        '.json': 'json',
+        '.yaml': 'yaml',
+        '.yml': 'yaml',
+        '.toml': 'toml',
+    }
+
+    @classmethod
+    def filetype_of(cls, path: typing.Union[str, os.PathLike]) -> str:
+        """ Returns the format of the file in the given path, according to its
+        extension. """
+
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in cls.FILETYPES:
+            raise ValidItError(
+                f"Can't determine the format of the file {str(path)!r}, " +
+                "use the 'filetype' argument"
+            )
+
+        return cls.FILETYPES[extension]
+
+    def __init__(self,
+                 template: BaseTemplate,
+                 path: typing.Union[str, os.PathLike],
+                 filetype: str = None,
+                 title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
+                 ) -> None:
+        """ Validate data from the file in the given path. The file is memory
+        mapped and parsed from the mapped buffer (see `ValidateFromBuffer`),
+        so it is not read into memory first. The default JSON and TOML
+        parsers still decode the whole file into a string before it is
+        parsed; use `parser='orjson'` to parse huge JSON files without the
+        decoded copy. YAML files are read from the mapped buffer in small
+        chunks. If the format of the file is not given, it is determined by
+        the file extension. """
+
+        if filetype is None:
+            filetype = self.filetype_of(path)
+
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # Empty files can't be memory mapped
+                buffer = b''
 
+        try:
+            super().__init__(
+                template, buffer, filetype, title, fail_fast, parser, lazy,
+                stats, max_errors,
+            )
         finally:
-            super().__init__(template, info, title)
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
 
 
-class ValidateFromYAML(ValidateFromFile):
+class ValidateFromJSONLine(ValidateFromFile):
+
+    def __init__(self,
+                 template: BaseTemplate,
+                 data: ValidateInformation,
+                 lineno: int,
+                 title: str = None,
+                 fail_fast: bool = False,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
+                 ) -> None:
+        """ The validation results of a single line (document) in a JSON Lines
+        file. The line number is added to the title. """
+
+        self.lineno = lineno
+        title = f'{title}:{lineno}' if title else f'line {lineno}'
+        super().__init__(template, data, title, fail_fast, lazy, stats,
+                         max_errors)
+
+
+class ValidateFromJSONLines:
 
     def __init__(self,
                  template: BaseTemplate,
                  fp: typing.IO,
                  title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
                  ) -> None:
+        """ Validate data from a JSON Lines (NDJSON) file, in which each line
+        is a separate JSON document. The file is read one line at a time when
+        iterating over this object, which yields a `ValidateFromJSONLine`
+        result for each document. Empty lines are skipped. """
 
-        extras = ExtraModules(
-            class_name=self.__class__.__name__,
-            extra_name='yaml',
-            module_names=('yaml',),
-        )
+        self._backend = get_parser('json', parser)
+        self._template = template
+        self._fp = fp
+        self._title = title
+        self._fail_fast = fail_fast
+        self._lazy = lazy
+        self._stats = stats
+        self._max_errors = max_errors
 
-        info = ValidateInformation()
+    def __iter__(self,) -> typing.Iterator[ValidateFromJSONLine]:
+        backend = self._backend
+
+        for lineno, line in enumerate(self._fp, start=1):
+            if not line.strip():
+                continue
+
+            size = None
+            if self._stats is not None:
+                size = len(line.encode('utf-8'))
+
+            info = ValidateFromFile._parse(
+                backend, lambda: backend.loads(line), self._stats, size)
+
+            for error in info.errors:
+                # The position is relative to the line. The column is
+                # unknown if the parser doesn't report the position.
+                error.pos = (lineno, error.pos[1] if error.pos else None)
+
+            yield ValidateFromJSONLine(
+                self._template, info, lineno, self._title, self._fail_fast,
+                self._lazy, self._stats, self._max_errors,
+            )
+
+
+class ValidateFromJSONStream(ValidateFromFile):
+
+    def __init__(self,
+                 template: BaseTemplate,
+                 fp: typing.IO,
+                 title: str = None,
+                 fail_fast: bool = False,
+                 chunk_size: int = 2 ** 16,
+                 max_errors: int = None,
+                 ) -> None:
+        """ Validate data from a JSON file while reading it, without loading
+        the whole file into memory. Lists and dictionaries that correspond to
+        a `TemplateList` or a `TemplateDict` are validated one element at a
+        time, so this is useful for huge documents (for example, a huge list
+        of records). Because the data is never fully loaded, the `data`
+        property is not available. """
+
+        info = ValidateInformation(validated=True)
+        info.errors.max_errors = max_errors
+        reader = JSONStreamReader(fp, chunk_size)
+        errors = RaiseOnErrorManager() if fail_fast else info.errors
 
         try:
-            info.data = extras.yaml.full_load(fp)
+            JSONStreamValidator(reader, errors).validate(template)
 
-        except extras.yaml.YAMLError as error:
+        except TemplateCheckError as error:
+            info.errors.register_error(error)
+
+        except json.JSONDecodeError as error:
             info.fatal_error = True
-            info.errors.register_error(YamlParsingError(error))
+            parsing_error = JsonParsingError(error)
+            parsing_error.pos = reader.position(error.pos)
+            info.errors.register_error(parsing_error)
 
         finally:
-            super().__init__(template, info, title)
+            super().__init__(template, info, title, fail_fast)
 
 
-class ValidateFromTOML(ValidateFromFile):
+class ValidateFromYAML(ValidateFromFile):
 
     def __init__(self,
                  template: BaseTemplate,
                  fp: typing.IO,
                  title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
                  ) -> None:
+        """ Validate data from a YAML file, using a user-made template.
+        The file is loaded just like `yaml.full_load`, unless the C
+        implementation of the loader is requested (`parser='libyaml'`). """
 
-        extras = ExtraModules(
-            class_name=self.__class__.__name__,
-            extra_name='toml',
-            module_names=('toml',),
-        )
+        backend = get_parser('yaml', parser)
+        info = self._parse(backend, lambda: backend.load(fp), stats)
+        super().__init__(template, info, title, fail_fast, lazy, stats,
+                         max_errors)
 
-        info = ValidateInformation()
 
-        try:
-            info.data = extras.toml.load(fp)
+class ValidateFromYAMLDocument(ValidateFromFile):
 
-        except extras.toml.TomlDecodeError as error:
-            info.fatal_error = True
-            info.errors.register_error(TomlParsingError(error))
+    def __init__(self,
+                 template: BaseTemplate,
+                 data: ValidateInformation,
+                 index: int,
+                 title: str = None,
+                 fail_fast: bool = False,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
+                 ) -> None:
+        """ The validation results of a single document in a YAML stream.
+        The index of the document (counted from zero) is added to the
+        title. """
 
-        finally:
-            super().__init__(template, info, title)
+        self.index = index
+        title = f'{title}#{index}' if title else f'document #{index}'
+        super().__init__(template, data, title, fail_fast, lazy, stats,
+                         max_errors)
+
+
+class ValidateFromYAMLStream:
+
+    def __init__(self,
+                 template: BaseTemplate,
+                 fp: typing.IO,
+                 title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
+                 ) -> None:
+        """ Validate a YAML stream, which contains multiple documents separated
+        by `---`. The documents are loaded one at a time when iterating over
+        this object, which yields a `ValidateFromYAMLDocument` result for each
+        document. If a document can't be parsed, the last result contains the
+        parsing error, and the rest of the stream is not loaded. """
+
+        self._backend = get_parser('yaml', parser)
+        self._template = template
+        self._fp = fp
+        self._title = title
+        self._fail_fast = fail_fast
+        self._lazy = lazy
+        self._stats = stats
+        self._max_errors = max_errors
+
+    def __iter__(self,) -> typing.Iterator[ValidateFromYAMLDocument]:
+        backend = self._backend
+        documents = backend.load_all(self._fp)
+
+        for index in itertools.count():
+            info = ValidateInformation()
+            start = time.perf_counter()
+
+            try:
+                info.data = next(documents)
+
+            except StopIteration:
+                return
+
+            except backend.errors as error:
+                info.fatal_error = True
+                info.errors.register_error(backend.parsing_error(error))
+
+            if self._stats is not None:
+                self._stats.record_parse(time.perf_counter() - start)
+
+            yield ValidateFromYAMLDocument(
+                self._template, info, index, self._title, self._fail_fast,
+                self._lazy, self._stats, self._max_errors,
+            )
+
+            if info.fatal_error:
+                return
+
+
+class ValidateFromTOML(ValidateFromFile):
+
+    def __init__(self,
+                 template: BaseTemplate,
+                 fp: typing.IO,
+                 title: str = None,
+                 fail_fast: bool = False,
+                 parser: typing.Union[str, ParserBackend] = None,
+                 lazy: bool = False,
+                 stats: ValidationStats = None,
+                 max_errors: int = None,
+                 ) -> None:
+        """ Validate data from a TOML file, using a user-made template.
+        The file is parsed using the `toml` package, unless another parser
+        is requested (for example, `parser='tomllib'`). """
+
+        backend = get_parser('toml', parser)
+        info = self._parse(backend, lambda: backend.load(fp), stats)
+        super().__init__(template, info, title, fail_fast, lazy, stats,
+                         max_errors)